@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# fuzz.py rev 19 Oct 2026
+# Seeded differential fuzzing of the search engines against bfs1 on many graph
+# shapes, checking path lengths and validity and timing each engine.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+import getopt
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+
+from onepair import engine_names, planner
+from onepair.allpairs import all_pairs_distances
+from onepair.batch import bfs_batch
+from onepair.bfs1 import bfs1
+from onepair.csr import CSREdgelist, make_csr_edgelist
+from onepair.external import node_state_bytes
+from onepair.gendata import read_undirected_edgelist
+from onepair.optional import import_numpy
+from onepair.partition import ShardedSearch, save_shards
+from onepair.planner import Planner, engine_info
+
+invalid_input_exit_code = 2
+
+# Graph shapes.  Each takes a random.Random and returns an edgelist list with
+# contiguous node numbers; lists may hold self-loops and duplicates, but every
+# edge is present in both directions.
+
+def _add_edge(el_arr, a, b):
+    el_arr[a].append(b)
+    if a != b:
+        el_arr[b].append(a)
+
+def gen_random(rng):
+    nr_nodes = rng.randint(2, 200)
+    el_arr = [[] for i in range(0, nr_nodes)]
+    for i in range(0, rng.randint(0, 3 * nr_nodes)):
+        _add_edge(el_arr, rng.randrange(nr_nodes), rng.randrange(nr_nodes))
+    return el_arr
+
+def gen_disconnected(rng):
+    el_arr = []
+    for part in range(0, rng.randint(2, 5)):
+        first = len(el_arr)
+        nr_nodes = rng.randint(1, 40)
+        el_arr.extend([[] for i in range(0, nr_nodes)])
+        for i in range(0, rng.randint(0, 2 * nr_nodes)):
+            _add_edge(el_arr, first + rng.randrange(nr_nodes),
+                      first + rng.randrange(nr_nodes))
+    return el_arr
+
+def gen_tree(rng):
+    nr_nodes = rng.randint(1, 300)
+    el_arr = [[] for i in range(0, nr_nodes)]
+    for node in range(1, nr_nodes):
+        _add_edge(el_arr, node, rng.randrange(max(0, node - rng.randint(1, 5)),
+                                              node))
+    return el_arr
+
+def gen_near_tree(rng):
+    el_arr = gen_tree(rng)
+    for i in range(0, rng.randint(1, 4)):
+        _add_edge(el_arr, rng.randrange(len(el_arr)),
+                  rng.randrange(len(el_arr)))
+    return el_arr
+
+def gen_dense(rng):
+    nr_nodes = rng.randint(2, 60)
+    el_arr = [[] for i in range(0, nr_nodes)]
+    fraction = rng.uniform(0.3, 0.9)
+    for a in range(0, nr_nodes):
+        for b in range(a + 1, nr_nodes):
+            if rng.random() < fraction:
+                _add_edge(el_arr, a, b)
+    return el_arr
+
+def gen_hubby(rng):
+    nr_nodes = rng.randint(20, 300)
+    el_arr = [[] for i in range(0, nr_nodes)]
+    hubs = rng.sample(range(0, nr_nodes), rng.randint(1, 5))
+    for node in range(0, nr_nodes):
+        for hub in hubs:
+            if node != hub and rng.random() < 0.3:
+                _add_edge(el_arr, node, hub)
+        if rng.random() < 0.5:
+            _add_edge(el_arr, node, rng.randrange(nr_nodes))
+    return el_arr
+
+def gen_loops_and_duplicates(rng):
+    el_arr = gen_random(rng)
+    nr_nodes = len(el_arr)
+    for i in range(0, rng.randint(1, nr_nodes)):
+        node = rng.randrange(nr_nodes)
+        _add_edge(el_arr, node, node)
+        if el_arr[node]:
+            _add_edge(el_arr, node, rng.choice(el_arr[node]))
+    return el_arr
+
+graph_shapes = [gen_random, gen_disconnected, gen_tree, gen_near_tree,
+                gen_dense, gen_hubby, gen_loops_and_duplicates]
+
+# Engines to check.  Each is (name, prepare, search, cleanup, batch): prepare
+# turns an edgelist list into what search takes as its edgelist, search is
+# called as search(root, target, prepared) with contiguous node numbers, or if
+# batch as search(pairs, prepared) returning the list of outputs, and cleanup,
+# if not None, is called with the prepared graph when done.
+
+fuzz_engines = []
+
+def register_fuzz_engine(name, prepare, search, cleanup=None, batch=False):
+    fuzz_engines.append((name, prepare, search, cleanup, batch))
+
+# Each engine in the planner's registry is prepared by converting the graph
+# through a Planner, which also cleans up the conversion, and the planner
+# itself is checked as one more engine.  The planners are given a budget for
+# external_nr_buffers blocks of external_block_size bytes, so that bfs_external
+# reads neighbor lists spanning blocks and evicts buffers even on small graphs.
+
+external_block_size = 64
+external_nr_buffers = 4
+
+def _make_planner(el_arr):
+    return Planner(el_arr, node_state_bytes(len(el_arr))
+                   + external_nr_buffers * external_block_size,
+                   block_size=external_block_size)
+
+def _registry_engine(info):
+    def prepare(el_arr):
+        planner = _make_planner(el_arr)
+        planner.graph(info.representation)
+        return planner
+    def search(root, target, planner):
+        return info.search(root, target, planner.graphs[info.representation])
+    return (prepare, search, Planner.close)
+
+def _planner_search(root, target, planner):
+    return planner.search(root, target)
+
+# The planner without a budget is told to expect enough queries to plan every
+# engine, and plans with the hub and numpy thresholds lowered, as those are
+# for graphs far bigger than these, so that its choices among the tree index,
+# hubs, numpy and bfs2 vary with the graph.
+
+fuzz_hub_min_nodes = 20
+fuzz_numpy_min_level_size = 8
+
+def _make_unbudgeted_planner(el_arr):
+    planner_obj = Planner(el_arr, expected_queries=planner.index_min_queries)
+    saved = (planner.hub_min_nodes, planner.numpy_min_level_size)
+    (planner.hub_min_nodes, planner.numpy_min_level_size) = (
+        fuzz_hub_min_nodes, fuzz_numpy_min_level_size)
+    try:
+        planner_obj.plan()  # kept until the query count changes its bucket
+    finally:
+        (planner.hub_min_nodes, planner.numpy_min_level_size) = saved
+    return planner_obj
+
+# bfs_batch is run on all the pairs at once, through several threads, the
+# pairs given as a generator.
+
+fuzz_nr_threads = 4
+
+def _batch_engine(use_numpy):
+    def prepare(el_arr):
+        return CSREdgelist(*make_csr_edgelist(el_arr)) if use_numpy else el_arr
+    def search(pairs, edgelist):
+        return bfs_batch((pair for pair in pairs), edgelist, fuzz_nr_threads,
+                         use_numpy)
+    return (prepare, search, None, True)
+
+# ShardedSearch runs on the graph saved as fuzz_nr_shards shards in a
+# temporary directory, removed with the shards by cleanup.
+
+fuzz_nr_shards = 3
+
+def _make_sharded(el_arr):
+    tmp_dir = tempfile.mkdtemp()
+    nr_shards = min(fuzz_nr_shards, len(el_arr))
+    prefix = os.path.join(tmp_dir, 'fuzz')
+    save_shards(el_arr, nr_shards, prefix)
+    return (tmp_dir, ShardedSearch(prefix, nr_shards))
+
+def _sharded_search(root, target, prepared):
+    return prepared[1].bfs(root, target)
+
+def _close_sharded(prepared):
+    prepared[1].close()
+    shutil.rmtree(prepared[0])
+
+# all_pairs_distances gives only lengths; the path is rebuilt by stepping
+# from root to a neighbor one closer to target each time, which checks the
+# matrix's lengths against each other as well as against bfs1.
+
+def _make_matrix(el_arr):
+    return (el_arr, all_pairs_distances(el_arr, block_size=64))
+
+def _matrix_search(root, target, prepared):
+    (el_arr, matrix) = prepared
+    path_len = matrix[root, target]
+    if path_len is None:
+        return None
+    path = [root]
+    for dist in range(path_len - 1, -1, -1):
+        for new_node in el_arr[path[-1]]:
+            if matrix[new_node, target] == dist:
+                path.append(new_node)
+                break
+    return (path_len, path)
+
+# The graph is written to a temporary file as pairs, with a self-loop on
+# every node so that isolated nodes are read too, and read back as an
+# UpperTriangleEdgelist, which bfs1 searches as it would a dict.
+
+def _make_upper_triangle(el_arr):
+    (fd, filename) = tempfile.mkstemp()
+    outfile = os.fdopen(fd, 'w')
+    for (node, el) in enumerate(el_arr):
+        outfile.write('{0} {0}\n'.format(node))
+        for new_node in el:
+            outfile.write('{0} {1}\n'.format(node, new_node))
+    outfile.close()
+    try:
+        return read_undirected_edgelist(filename, upper_only=True)
+    finally:
+        os.remove(filename)
+
+def register_default_engines():
+    del fuzz_engines[:]
+    for name in engine_names():
+        info = engine_info(name)
+        if info.available():
+            register_fuzz_engine(name, *_registry_engine(info))
+    register_fuzz_engine('planner', _make_planner, _planner_search,
+                         Planner.close)
+    register_fuzz_engine('planner_unbudgeted', _make_unbudgeted_planner,
+                         _planner_search, Planner.close)
+    register_fuzz_engine('bfs_batch', *_batch_engine(False))
+    if import_numpy() is not None:
+        register_fuzz_engine('bfs_batch_numpy', *_batch_engine(True))
+    register_fuzz_engine('sharded', _make_sharded, _sharded_search,
+                         _close_sharded)
+    register_fuzz_engine('all_pairs', _make_matrix, _matrix_search)
+    register_fuzz_engine('upper_triangle', _make_upper_triangle, bfs1)
+
+register_default_engines()
+
+# Returns None if output is a correct answer for root, target in el_arr given
+# bfs1's expected output, else a description of what is wrong.  Engines may
+# return the path in either direction, as bfs1,2 do.
+
+def check_output(el_arr, root, target, expected, output):
+    if expected is None or output is None:
+        if expected is None and output is None:
+            return None
+        return 'expected {0}, got {1}'.format(expected, output)
+    (path_len, path) = output
+    if path_len != expected[0]:
+        return 'expected length {0}, got {1}'.format(expected[0], output)
+    if len(path) != path_len + 1:
+        return 'length {0} but {1} nodes in path'.format(path_len, len(path))
+    if sorted([path[0], path[-1]]) != sorted([root, target]):
+        return 'path {0} does not join {1} and {2}'.format(path, root, target)
+    for (a, b) in zip(path, path[1:]):
+        if b not in el_arr[a]:
+            return 'path {0} uses missing edge ({1}, {2})'.format(path, a, b)
+    return None
+
+# Generates nr_graphs graphs, cycling through graph_shapes, and checks every
+# engine in fuzz_engines against bfs1 on nr_queries random pairs in each, all
+# from random.Random(seed).  Returns (problems, timings): problems, a list of
+# strings, each naming the seed, graph, engine and pair so it can be rerun;
+# timings, a dict from engine name to (prepare seconds, search seconds).  If
+# baseline (a dict as timings, or the name of a file from save_timings) is
+# given, an engine whose search time is more than tolerance times the
+# baseline's is also a problem.
+
+def fuzz(seed=0, nr_graphs=70, nr_queries=30, baseline=None, tolerance=2.0,
+         verbose=False):
+    rng = random.Random(seed)
+    problems = []
+    timings = dict((engine[0], [0.0, 0.0]) for engine in fuzz_engines)
+    for graph_nr in range(0, nr_graphs):
+        shape = graph_shapes[graph_nr % len(graph_shapes)]
+        el_arr = shape(rng)
+        nr_nodes = len(el_arr)
+        el = dict(enumerate(el_arr))
+        pairs = [(rng.randrange(nr_nodes), rng.randrange(nr_nodes))
+                 for i in range(0, nr_queries)]
+        expected = [bfs1(root, target, el) for (root, target) in pairs]
+        if verbose:
+            print('graph {0} {1}, {2} nodes'.format(graph_nr, shape.__name__,
+                                                    nr_nodes))
+        for (name, prepare, search, cleanup, batch) in fuzz_engines:
+            start = timeit.default_timer()
+            prepared = prepare(el_arr)
+            timings[name][0] += timeit.default_timer() - start
+            outputs = []
+            start = timeit.default_timer()
+            if batch:
+                outputs = search(pairs, prepared)
+            else:
+                for (root, target) in pairs:
+                    outputs.append(search(root, target, prepared))
+            timings[name][1] += timeit.default_timer() - start
+            if cleanup is not None:
+                cleanup(prepared)
+            for ((root, target), expect, output) in zip(pairs, expected,
+                                                        outputs):
+                problem = check_output(el_arr, root, target, expect, output)
+                if problem:
+                    problems.append(
+                        'seed {0} graph {1} ({2}) {3}({4}, {5}): {6}'.format(
+                            seed, graph_nr, shape.__name__, name, root,
+                            target, problem))
+    timings = dict((name, tuple(t)) for (name, t) in timings.items())
+    if baseline is not None:
+        if not isinstance(baseline, dict):
+            baseline = load_timings(baseline)
+        for (name, (prepare_t, search_t)) in sorted(timings.items()):
+            if name in baseline and search_t > tolerance * baseline[name][1]:
+                problems.append(('{0} search time {1:.4f}s, over {2} times '
+                                 + 'baseline {3:.4f}s').format(
+                        name, search_t, tolerance, baseline[name][1]))
+    return (problems, timings)
+
+def save_timings(timings, filename):
+    outfile = open(filename, 'w')
+    json.dump(timings, outfile, indent=1, sort_keys=True)
+    outfile.close()
+
+def load_timings(filename):
+    infile = open(filename, 'r')
+    timings = json.load(infile)
+    infile.close()
+    return dict((name, tuple(t)) for (name, t) in timings.items())
+
+def usage():
+    print(
+        """
+Usage: python fuzz.py [-s <seed>] [-g <nr_graphs>] [-q <nr_queries>]
+                      [-b <baseline_file>] [-t <tolerance>]
+                      [-w <timings_file>] [-v] [-h]
+  defaults: python fuzz.py -s 0 -g 70 -q 30 -t 2.0
+  -b flags engines slower than tolerance times the timings in baseline_file;
+  -w saves this run's timings for use as a baseline.
+""")
+
+def main(argv):
+    seed = 0
+    nr_graphs = 70
+    nr_queries = 30
+    baseline = None
+    tolerance = 2.0
+    timings_filename = None
+    verbose = False
+    if isinstance(argv, str):
+        argv = argv.split()
+    try:
+        (opts, args) = getopt.getopt(argv, 's:g:q:b:t:w:vh')
+        for (opt, arg) in opts:
+            if opt == '-s':
+                seed = int(arg)
+            elif opt == '-g':
+                nr_graphs = int(arg)
+            elif opt == '-q':
+                nr_queries = int(arg)
+            elif opt == '-b':
+                baseline = arg
+            elif opt == '-t':
+                tolerance = float(arg)
+            elif opt == '-w':
+                timings_filename = arg
+            elif opt == '-v':
+                verbose = True
+            elif opt == '-h':
+                usage()
+                sys.exit(0)
+    except (getopt.GetoptError, ValueError) as err:
+        print(str(err))
+        usage()
+        sys.exit(invalid_input_exit_code)
+
+    (problems, timings) = fuzz(seed, nr_graphs, nr_queries, baseline,
+                               tolerance, verbose)
+    for (name, (prepare_t, search_t)) in sorted(timings.items()):
+        print('  {0} prepare {1:.4f} search {2:.4f}'.format(name, prepare_t,
+                                                            search_t))
+    for problem in problems:
+        print('  error,', problem)
+    if timings_filename:
+        save_timings(timings, timings_filename)
+    return problems
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
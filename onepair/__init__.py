@@ -0,0 +1,67 @@
+# onepair/__init__.py rev 19 Oct 2026
+# Single pair shortest paths for unweighted undirected graphs.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+# Nothing is imported until used: the names below, and the submodules, are
+# loaded on first attribute access (PEP 562), so a worker that only needs bfs2
+# doesn't pay to import the generators, the multiprocessing and threading
+# modules, or numpy.
+
+import importlib
+import os
+
+# Public name: (submodule, attribute in it).  The search functions are reached
+# through get_engine, or as onepair.bfs2.bfs2 and so on, since a package
+# attribute bfs2 would be replaced by the submodule once it is imported.
+
+_exports = {
+    'read_edgelist':            ('gendata', 'read_edgelist'),
+    'make_contiguous_edgelist': ('gendata', 'make_contiguous_edgelist'),
+    'CSREdgelist':              ('csr',     'CSREdgelist'),
+    'make_csr_edgelist':        ('csr',     'make_csr_edgelist'),
+    'Planner':                  ('planner', 'Planner'),
+    'graph_stats':              ('planner', 'graph_stats'),
+}
+
+_submodules = ['allpairs', 'batch', 'bfs1', 'bfs2', 'compress', 'csr',
+               'external', 'gendata', 'hubs', 'optional', 'parbuild',
+               'partition', 'planner', 'resultsink', 'shmgraph', 'snapshot',
+               'treeindex', 'treepath']
+
+# The engines, each function taking (root, target, graph) and returning
+# (path_len, path) or None as bfs1,2 do, are registered in planner with the
+# graph representation each searches; planner.Planner picks among them.
+
+default_engine = 'bfs2'
+
+__all__ = sorted(_exports) + ['get_engine', 'engine_names']
+
+def __getattr__(name):
+    if name in _exports:
+        (module_name, attr) = _exports[name]
+        value = getattr(importlib.import_module('.' + module_name, __name__),
+                        attr)
+    elif name in _submodules:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(
+                __name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | set(_submodules))
+
+def engine_names():
+    return sorted(__getattr__('planner').engine_registry)
+
+# Returns the engine function of the given name, importing only its module
+# (and planner, which imports no engine).  With no name, uses the
+# ONEPAIR_ENGINE environment variable if set, else default_engine.  Raises
+# ValueError for an unknown name.
+
+def get_engine(name=None):
+    if name is None:
+        name = os.environ.get('ONEPAIR_ENGINE', default_engine)
+    return __getattr__('planner').engine_info(name).search
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# allpairs.py rev 19 Oct 2026
+# Shortest path lengths between all pairs of nodes, by bit-parallel breadth
+# first search from blocks of roots at once, into a uint8 distance matrix.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+import mmap
+
+# The searches from a block of roots run together: for each node, a python int
+# holds one byte lane per root, 1 if the root's search has reached the node.
+# A level is then, for each node, an OR of its neighbors' frontier ints and a
+# mask against its own visited int, so the per-root work is done inside the
+# long integer operations.  Byte rather than bit lanes let each node's distances
+# be accumulated by adding its not-yet-visited int once per level: a root that
+# reaches the node at level d adds 1 at levels 0 through d - 1.  As the graph is
+# undirected, the distances from the block's roots to node v are also row v of
+# the matrix in the block's columns, so they are stored with one slice.
+
+unreachable = 255
+
+class DistanceMatrix(object):
+    """ nr_nodes by nr_nodes matrix of uint8 path lengths, row major in data (a
+        bytearray or mmap), with unreachable for no path.  self[root, target]
+        returns the path length, or None if no path.
+    """
+    def __init__(self, nr_nodes, data):
+        self.nr_nodes = nr_nodes
+        self.data = data
+
+    def __getitem__(self, pair):
+        path_len = self.data[pair[0] * self.nr_nodes + pair[1]]
+        return None if path_len == unreachable else path_len
+
+    def row(self, root):
+        return self.data[root * self.nr_nodes:(root + 1) * self.nr_nodes]
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+# Given an edgelist list with contiguous node numbers starting at 0, as for
+# bfs2, returns a DistanceMatrix of the shortest path lengths between all pairs
+# of nodes, doing block_size roots at a time.  If filename is given, the matrix
+# is written to that file through a memory map, and the DistanceMatrix uses the
+# map; otherwise it's in memory.  Raises ValueError if some path is too long to
+# fit in a uint8 below unreachable.
+
+def all_pairs_distances(edgelist_array, filename=None, block_size=4096):
+    nr_nodes = len(edgelist_array)
+    size = nr_nodes * nr_nodes
+    if filename is None:
+        data = bytearray(size)
+    else:
+        outfile = open(filename, 'w+b')
+        outfile.truncate(max(size, 1))
+        data = mmap.mmap(outfile.fileno(), max(size, 1))
+        outfile.close()
+
+    for first in range(0, nr_nodes, block_size):
+        nr_roots = min(block_size, nr_nodes - first)
+        all_lanes = int.from_bytes(b'\x01' * nr_roots, 'little')
+        visited = [0] * nr_nodes
+        for i in range(0, nr_roots):
+            visited[first + i] = 1 << (8 * i)
+        frontier = list(visited)
+        dist = [all_lanes ^ v for v in visited]
+        level = 0
+        active = True
+        while active:
+            level += 1
+            active = False
+            new_frontier = [0] * nr_nodes
+            for node in range(0, nr_nodes):
+                reached = 0
+                for new_node in edgelist_array[node]:
+                    reached |= frontier[new_node]
+                reached &= ~visited[node]
+                if reached:
+                    new_frontier[node] = reached
+                    visited[node] |= reached
+                    active = True
+            if active:
+                # Only a level that reaches something needs a length.
+                if level >= unreachable:
+                    raise ValueError('path length over {0}'.format(
+                            unreachable - 1))
+                for node in range(0, nr_nodes):
+                    dist[node] += all_lanes ^ visited[node]
+            frontier = new_frontier
+        for node in range(0, nr_nodes):
+            # Lanes never reached hold a count below unreachable; OR them up.
+            never = (all_lanes ^ visited[node]) * unreachable
+            start = node * nr_nodes + first
+            data[start:start + nr_roots] = (dist[node] | never).to_bytes(
+                nr_roots, 'little')
+
+    if filename is not None:
+        data.flush()
+    return DistanceMatrix(nr_nodes, data)
+
+# Opens a matrix written by all_pairs_distances, memory mapped read-only.
+
+def open_distance_matrix(filename, nr_nodes):
+    infile = open(filename, 'rb')
+    data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    infile.close()
+    return DistanceMatrix(nr_nodes, data)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# batch.py rev 19 Oct 2026
+# Runs many single pair searches over one resident graph on a thread pool.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+# The searches only run in parallel if the inner loop releases the GIL.
+# bfs_csr_numpy expands a whole bfs level at a time with vectorized numpy
+# operations (gather, unique, fancy indexing), which release the GIL while
+# they run, but each level costs it a fixed overhead, so by default it is
+# used only on graphs whose levels are wide by the planner's rule
+# (planner.wide_levels); otherwise bfs2 is used and the threads just take
+# turns.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from .bfs2    import bfs2
+from .csr     import CSREdgelist, make_csr_edgelist
+from .planner import graph_stats, plan_min_queries, wide_levels
+
+from .optional import import_numpy
+
+# Follows parent links from node to the end of its tree, returning the nodes
+# in the order visited, node first.
+
+def _parent_chain(node, parent):
+    accum = []
+    while node >= 0:
+        accum.append(int(node))
+        node = parent[node]
+    return accum
+
+# Finds shortest path from root to target given CSR offsets and neighbors
+# numpy arrays for a graph with contiguous node numbers, as bfs2 does, moving
+# from both ends toward the middle a whole level at a time.  Where bfs2 stops at
+# the first meeting node it finds in a level, this takes the meeting that gives
+# the shortest path among all found in the level, so the path length is the
+# same as bfs2's though the path may differ.
+# Returns (path_len, path), path given as list of nodes, or None if no path.
+
+def bfs_csr_numpy(root, target, offsets, neighbors):
+    if (root == target):
+        return (0, [root])
+    numpy = import_numpy()
+    nr_nodes = len(offsets) - 1
+
+    # dist -1 means not reached; parent -1 marks the end of a chain.
+    dist_r = numpy.full(nr_nodes, -1, dtype=numpy.int64)
+    dist_t = numpy.full(nr_nodes, -1, dtype=numpy.int64)
+    parent_r = numpy.full(nr_nodes, -1, dtype=numpy.int64)
+    parent_t = numpy.full(nr_nodes, -1, dtype=numpy.int64)
+    dist_r[root] = 0
+    dist_t[target] = 0
+    r_level_nodes = numpy.array([root], dtype=numpy.int64)
+    t_level_nodes = numpy.array([target], dtype=numpy.int64)
+    r_level = 0
+    t_level = 0
+
+    while r_level_nodes.size and t_level_nodes.size:
+        from_r = r_level_nodes.size <= t_level_nodes.size
+        if from_r:
+            (level_nodes, level, dist, parent, other_dist, other_parent) = (
+                r_level_nodes, r_level, dist_r, parent_r, dist_t, parent_t)
+        else:
+            (level_nodes, level, dist, parent, other_dist, other_parent) = (
+                t_level_nodes, t_level, dist_t, parent_t, dist_r, parent_r)
+
+        # Gather every (node, new_node) edge out of the level.
+        starts = offsets[level_nodes]
+        counts = offsets[level_nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        from_nodes = numpy.repeat(level_nodes, counts)
+        first_pos = numpy.cumsum(counts) - counts
+        edge_ix = (numpy.arange(total, dtype=numpy.int64)
+                   + numpy.repeat(starts - first_pos, counts))
+        new_nodes = neighbors[edge_ix].astype(numpy.int64)
+
+        # Meeting the other side ends the search.
+        other = other_dist[new_nodes]
+        hits = numpy.flatnonzero(other >= 0)
+        if hits.size:
+            best = hits[numpy.argmin(other[hits])]
+            near = _parent_chain(from_nodes[best], parent)
+            far = _parent_chain(new_nodes[best], other_parent)
+            accum = near[::-1] + far if from_r else far[::-1] + near
+            return (len(accum) - 1, accum)
+
+        unseen = dist[new_nodes] < 0
+        (next_nodes, first) = numpy.unique(new_nodes[unseen],
+                                           return_index=True)
+        parent[next_nodes] = from_nodes[unseen][first]
+        dist[next_nodes] = level + 1
+        if from_r:
+            (r_level_nodes, r_level) = (next_nodes, level + 1)
+        else:
+            (t_level_nodes, t_level) = (next_nodes, level + 1)
+    return None
+
+# Runs one search per (root, target) pair in pairs, node numbers contiguous
+# starting at 0, over edgelist, a list of lists as for bfs2 or a CSREdgelist,
+# using nr_threads threads (default os.cpu_count()).  pairs may be any
+# iterable, a generator included; it is read only once.  Uses bfs_csr_numpy if
+# use_numpy, else bfs2.  By default uses bfs_csr_numpy if numpy is available
+# and the graph's levels are wide, judged from stats (a planner.GraphStats,
+# such as a Planner's); if stats isn't given, they're computed only for a
+# batch of at least planner.plan_min_queries pairs, as for fewer they cost
+# more than the numpy engine could save, and otherwise bfs2 is used.
+# Returns the list of outputs, in the order of pairs, or if sink (a
+# resultsink.ResultWriter) is given, writes them to it in that order instead
+# of keeping them, and returns None.
+
+def bfs_batch(pairs, edgelist, nr_threads=None, use_numpy=None, sink=None,
+              stats=None):
+    numpy = import_numpy()
+    if use_numpy is None:
+        if (stats is None and numpy is not None
+            and hasattr(pairs, '__len__') and len(pairs) >= plan_min_queries):
+            stats = graph_stats(edgelist)
+        use_numpy = (numpy is not None and stats is not None
+                     and wide_levels(stats))
+    if use_numpy:
+        if not isinstance(edgelist, CSREdgelist):
+            edgelist = CSREdgelist(*make_csr_edgelist(edgelist))
+        offsets = numpy.asarray(edgelist.offsets)
+        neighbors = numpy.asarray(edgelist.neighbors)
+        def search(pair):
+            return (pair, bfs_csr_numpy(pair[0], pair[1], offsets,
+                                        neighbors))
+    else:
+        def search(pair):
+            return (pair, bfs2(pair[0], pair[1], edgelist))
+    if nr_threads is None:
+        nr_threads = os.cpu_count() or 1
+    if nr_threads <= 1:
+        return _collect(map(search, pairs), sink)
+    with ThreadPoolExecutor(max_workers=nr_threads) as executor:
+        return _collect(executor.map(search, pairs), sink)
+
+# results yields (pair, output), each output with the pair it came from.
+
+def _collect(results, sink):
+    if sink is None:
+        return [output for (pair, output) in results]
+    for (pair, output) in results:
+        sink.write(pair[0], pair[1], output)
+    return None
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# compress.py rev 19 Oct 2026
+# Compressed form of the contiguous edgelist: each neighbor list sorted, gap
+# encoded, and stored as byte-aligned varints.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+
+# Each neighbor list is encoded as in WebGraph: the first neighbor as a signed
+# (zigzag) difference from the node's own number, since neighbors tend to be
+# numbered near the node, then each later neighbor as its (nonnegative, since
+# duplicates are kept) gap from the one before.  Each value is a varint, 7 bits
+# per byte, low bits first, high bit set on all but the last byte.
+
+def _append_varint(data, value):
+    while value >= 0x80:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+# Given an edgelist list with contiguous node numbers starting at 0, as from
+# gendata.make_contiguous_edgelist, returns a CompressedEdgelist for it.
+
+def make_compressed_edgelist(edgelist_array):
+    nr_nodes = len(edgelist_array)
+    offsets = array('q', [0]) * (nr_nodes + 1)
+    data = bytearray()
+    nr_neighbors = 0
+    for ix in range(0, nr_nodes):
+        el = sorted(edgelist_array[ix])
+        if el:
+            _append_varint(data, _zigzag(el[0] - ix))
+            prev = el[0]
+            for node in el[1:]:
+                _append_varint(data, node - prev)
+                prev = node
+        nr_neighbors += len(el)
+        offsets[ix + 1] = len(data)
+    return CompressedEdgelist(offsets, bytes(data), nr_neighbors)
+
+class CompressedEdgelist(object):
+    """ Read-only edgelist list usable by bfs2 in place of the list of lists
+        from make_contiguous_edgelist; self[ix] decodes the sorted neighbor
+        list of node ix.  offsets[ix] is the byte offset in data of node ix's
+        list.
+    """
+    def __init__(self, offsets, data, nr_neighbors):
+        self.offsets = offsets
+        self.data = data
+        self.nr_neighbors = nr_neighbors
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # Most gaps fit in one byte, so the loop checks for that case first.
+
+    def __getitem__(self, ix):
+        neighbors = []
+        append = neighbors.append
+        value = 0
+        shift = 0
+        node = None
+        for byte in self.data[self.offsets[ix]:self.offsets[ix + 1]]:
+            if byte < 0x80 and shift == 0:
+                value = byte
+            elif byte & 0x80:
+                value |= (byte & 0x7f) << shift
+                shift += 7
+                continue
+            else:
+                value |= byte << shift
+                shift = 0
+            if node is None:
+                node = ix + (value >> 1 if not value & 1
+                             else -((value + 1) >> 1))
+            else:
+                node += value
+            append(node)
+            value = 0
+        return neighbors
+
+    def __iter__(self):
+        for ix in range(0, len(self)):
+            yield self[ix]
+
+    # Counts the bytes of offsets and data together, per directed edge, that
+    # is, per entry of the uncompressed neighbor lists.
+
+    def bytes_per_edge(self):
+        nr_bytes = len(self.data) + len(self.offsets) * self.offsets.itemsize
+        return nr_bytes / float(max(self.nr_neighbors, 1))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# csr.py rev 19 Oct 2026
+# Compressed sparse row form of the contiguous edgelist, plus an id
+# translation that needs no per-process dict.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import bisect
+
+# Given an edgelist list with contiguous node numbers starting at 0, as from
+# gendata.make_contiguous_edgelist, returns (offsets, neighbors) arrays: the
+# neighbors of node ix are neighbors[offsets[ix]:offsets[ix + 1]].  Offsets
+# are int64, neighbors int32.
+
+def make_csr_edgelist(edgelist_array):
+    nr_nodes = len(edgelist_array)
+    offsets = array('q', [0]) * (nr_nodes + 1)
+    neighbors = array('i')
+    total = 0
+    for ix in range(0, nr_nodes):
+        el = edgelist_array[ix]
+        neighbors.extend(el)
+        total += len(el)
+        offsets[ix + 1] = total
+    return (offsets, neighbors)
+
+# Given the list translating contiguous to meaningful node numbers, returns
+# (sorted_nr, sorted_ix) int64 arrays, the meaningful numbers in increasing
+# order and the contiguous number of each, for use by NodeNrToIx.
+
+def make_nr_to_ix_arrays(node_ix_to_nr):
+    order = sorted(range(0, len(node_ix_to_nr)), key=node_ix_to_nr.__getitem__)
+    sorted_nr = array('q', [node_ix_to_nr[ix] for ix in order])
+    sorted_ix = array('q', order)
+    return (sorted_nr, sorted_ix)
+
+class CSREdgelist(object):
+    """ Read-only edgelist list over CSR arrays, usable by bfs2 in place of the
+        list of lists from make_contiguous_edgelist.  offsets and neighbors
+        may be any buffers of integers (array, memoryview, numpy array);
+        neighbor lists are returned as memoryview slices, so no copying.
+    """
+    def __init__(self, offsets, neighbors):
+        self.offsets = memoryview(offsets)
+        self.neighbors = memoryview(neighbors)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, ix):
+        return self.neighbors[self.offsets[ix]:self.offsets[ix + 1]]
+
+    def __iter__(self):
+        for ix in range(0, len(self)):
+            yield self[ix]
+
+    def degree(self, ix):
+        return self.offsets[ix + 1] - self.offsets[ix]
+
+    def release(self):
+        self.offsets.release()
+        self.neighbors.release()
+
+class NodeNrToIx(object):
+    """ Read-only stand-in for the node_nr_to_ix dict of
+        make_contiguous_edgelist, by binary search in the arrays from
+        make_nr_to_ix_arrays.
+    """
+    def __init__(self, sorted_nr, sorted_ix):
+        self.sorted_nr = memoryview(sorted_nr)
+        self.sorted_ix = memoryview(sorted_ix)
+
+    def __len__(self):
+        return len(self.sorted_nr)
+
+    def _find(self, nr):
+        i = bisect.bisect_left(self.sorted_nr, nr)
+        if i < len(self.sorted_nr) and self.sorted_nr[i] == nr:
+            return i
+        return None
+
+    def __getitem__(self, nr):
+        i = self._find(nr)
+        if i is None:
+            raise KeyError(nr)
+        return self.sorted_ix[i]
+
+    def __contains__(self, nr):
+        return self._find(nr) is not None
+
+    def get(self, nr, default=None):
+        i = self._find(nr)
+        return default if i is None else self.sorted_ix[i]
+
+    def release(self):
+        self.sorted_nr.release()
+        self.sorted_ix.release()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# external.py rev 19 Oct 2026
+# Semi-external bidirectional bfs: only per node state (offsets, parents, the
+# current levels) is kept in memory, while the neighbor lists are read from a
+# file through a bounded pool of block buffers.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+from collections import OrderedDict
+import struct
+
+# Neighbor file format, native byte order: a header of (magic, version,
+# nr_nodes, nr_neighbors) int64s, the int64 offsets (nr_nodes + 1) and then the
+# int32 neighbors, as in csr.make_csr_edgelist.
+
+neighbor_file_magic = 0x6f6e65706e6272   # 'onepnbr'
+neighbor_file_version = 1
+_header = struct.Struct('=qqqq')
+
+# Writes the neighbor file for an edgelist list with contiguous node numbers
+# starting at 0 (or a CSREdgelist), one neighbor list at a time.
+
+def write_neighbor_file(edgelist_array, filename):
+    nr_nodes = len(edgelist_array)
+    offsets = array('q', [0]) * (nr_nodes + 1)
+    for ix in range(0, nr_nodes):
+        offsets[ix + 1] = offsets[ix] + len(edgelist_array[ix])
+    outfile = open(filename, 'wb')
+    outfile.write(_header.pack(neighbor_file_magic, neighbor_file_version,
+                               nr_nodes, offsets[nr_nodes]))
+    outfile.write(offsets.tobytes())
+    for ix in range(0, nr_nodes):
+        outfile.write(array('i', edgelist_array[ix]).tobytes())
+    outfile.close()
+
+class NeighborFile(object):
+    """ Read-only edgelist list over a neighbor file, usable by bfs2 in place
+        of the list of lists from make_contiguous_edgelist.  Only the offsets
+        are held in memory; neighbors are read in blocks of block_size bytes,
+        of which at most nr_buffers are cached, least recently used dropped
+        first.  block_size is rounded down to a multiple of 4, so must be at
+        least 4, one neighbor.
+    """
+    def __init__(self, filename, block_size=1 << 16, nr_buffers=64):
+        if block_size < 4:
+            raise ValueError('block size {0} under 4 bytes'.format(block_size))
+        self.infile = open(filename, 'rb')
+        (magic, version, nr_nodes, nr_neighbors) = _header.unpack(
+            self.infile.read(_header.size))
+        if magic != neighbor_file_magic or version != neighbor_file_version:
+            raise ValueError('{0} is not a version {1} neighbor file'.format(
+                    filename, neighbor_file_version))
+        self.offsets = array('q')
+        self.offsets.fromfile(self.infile, nr_nodes + 1)
+        self.neighbors_start = _header.size + 8 * (nr_nodes + 1)
+        self.neighbors_size = 4 * nr_neighbors
+        self.block_size = block_size - block_size % 4
+        self.nr_buffers = nr_buffers
+        self.buffers = OrderedDict()
+        self.nr_reads = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.infile.close()
+        self.buffers.clear()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def degree(self, ix):
+        return self.offsets[ix + 1] - self.offsets[ix]
+
+    def _block(self, block_nr):
+        buf = self.buffers.get(block_nr)
+        if buf is not None:
+            self.buffers.move_to_end(block_nr)
+            return buf
+        self.infile.seek(self.neighbors_start + block_nr * self.block_size)
+        buf = self.infile.read(min(self.block_size, self.neighbors_size
+                                   - block_nr * self.block_size))
+        self.nr_reads += 1
+        self.buffers[block_nr] = buf
+        if len(self.buffers) > self.nr_buffers:
+            self.buffers.popitem(last=False)
+        return buf
+
+    def __getitem__(self, ix):
+        start = 4 * self.offsets[ix]
+        end = 4 * self.offsets[ix + 1]
+        raw = bytearray()
+        while start < end:
+            (block_nr, pos) = divmod(start, self.block_size)
+            buf = self._block(block_nr)
+            piece = buf[pos:pos + end - start]
+            raw += piece
+            start += len(piece)
+        neighbors = array('i')
+        neighbors.frombytes(bytes(raw))
+        return neighbors
+
+    # Reads the blocks holding the given nodes' neighbor lists that aren't
+    # cached, in file order, as far as the pool has room, so that a level's
+    # reads are sequential whatever order its nodes are expanded in.
+
+    def prefetch(self, nodes):
+        block_nrs = set()
+        for ix in nodes:
+            start = 4 * self.offsets[ix]
+            end = 4 * self.offsets[ix + 1]
+            if start < end:
+                block_nrs.update(range(start // self.block_size,
+                                       (end - 1) // self.block_size + 1))
+                if len(block_nrs) >= self.nr_buffers:
+                    break
+        for block_nr in sorted(block_nrs)[:self.nr_buffers]:
+            self._block(block_nr)
+
+# Returns the bytes of per node state bfs_external keeps for nr_nodes nodes:
+# 8 of offset and 4 in each of the two parent arrays, plus the int32 level
+# arrays, which together hold each node at most once, counted as 8 to allow
+# for array growth.
+
+def node_state_bytes(nr_nodes):
+    return 24 * (nr_nodes + 1)
+
+# Opens filename as a NeighborFile with as many buffers as fit in
+# memory_budget bytes after the per node state of bfs_external.  Raises
+# ValueError if the per node state alone doesn't fit.
+
+def open_neighbor_file(filename, memory_budget, block_size=1 << 16):
+    nfile = NeighborFile(filename, block_size, 1)
+    left = memory_budget - node_state_bytes(len(nfile))
+    if left < nfile.block_size:
+        nfile.close()
+        raise ValueError(('memory budget {0} too small for {1} nodes and one '
+                          + 'block of {2}').format(memory_budget, len(nfile),
+                                                   nfile.block_size))
+    nfile.nr_buffers = left // nfile.block_size
+    return nfile
+
+# Finds shortest path from root to target given a NeighborFile, by the same
+# steps as bfs2, so with the same result, but with the visited dicts replaced
+# by per node parent arrays (unvisited -2, root or target -1), the levels kept
+# in int32 arrays rather than lists of int objects, and each level's blocks
+# prefetched in file order before it is expanded.
+# Returns (path_len, path), path given as list of nodes, or None if no path.
+
+def bfs_external(root, target, nfile):
+    if (root == target):
+        return (0, [root])
+
+    if nfile.degree(root) > nfile.degree(target):
+        (root, target) = (target, root)
+
+    nr_nodes = len(nfile)
+    parent_r = array('i', [-2]) * nr_nodes
+    parent_t = array('i', [-2]) * nr_nodes
+    parent_r[root] = -1
+    parent_t[target] = -1
+    r_level_nodes = array('i', [root])
+    t_level_nodes = array('i', [target])
+
+    match_node = None
+
+    while (match_node is None) and r_level_nodes and t_level_nodes:
+        if len(r_level_nodes) <= len(t_level_nodes):
+            (level_nodes, parent, other_parent) = (r_level_nodes, parent_r,
+                                                   parent_t)
+            r_level_nodes = next_level_nodes = array('i')
+        else:
+            (level_nodes, parent, other_parent) = (t_level_nodes, parent_t,
+                                                   parent_r)
+            t_level_nodes = next_level_nodes = array('i')
+        nfile.prefetch(level_nodes)
+        for node in level_nodes:
+            for new_node in nfile[node]:
+                if parent[new_node] == -2:
+                    parent[new_node] = node
+                    next_level_nodes.append(new_node)
+                if other_parent[new_node] != -2:
+                    match_node = new_node
+                    break
+            if match_node is not None:
+                break
+
+    if match_node is not None:
+        accum = [match_node]
+        p = parent_r[match_node]
+        while p >= 0:
+            accum.append(p)
+            p = parent_r[p]
+        accum.reverse()
+        p = parent_t[match_node]
+        while p >= 0:
+            accum.append(p)
+            p = parent_t[p]
+        return (len(accum) - 1, accum)
+    else:
+        return None
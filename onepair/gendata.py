@@ -0,0 +1,458 @@
+#!/usr/bin/env python
+# gendata.py rev 28 Jan 2014 Stuart Ambler
+# Generate or read graphs for testings; generates trees or random graphs.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import bisect
+import math
+import random
+import tempfile
+
+from .optional import import_numpy
+
+# Returns as a list of pairs, the edges of the graph
+#
+# 1--2--3--4  8--9
+# |      \ |
+# 6--7    \5
+
+def example_edgelist_of_pairs():
+    return [(2, 1),
+            (1, 2),
+            (3, 2),
+            (2, 3),
+            (4, 3),
+            (5, 3),
+            (3, 4),
+            (5, 4),
+            (3, 5),
+            (4, 5),
+            (6, 1),
+            (1, 6),
+            (7, 6),
+            (6, 7),
+            (9, 8),
+            (8, 9)]
+
+# Returns the edges of the example graph as a list of pairs, one per undirected
+# edge, for read_undirected_edgelist.
+
+def example_undirected_edgelist_of_pairs():
+    return [pair for pair in example_edgelist_of_pairs() if pair[0] < pair[1]]
+
+# Returns data for checking the results of finding shortest paths in the data
+# from example_edgelist_lines, a dict with keys pairs of nodes and values pairs
+# of shortest path lengths and shortest paths.
+
+def example_shortest_paths():
+    half = {(1, 2):(1, [1, 2]),
+            (1, 3):(2, [1, 2, 3]),
+            (1, 4):(3, [1, 2, 3, 4]),
+            (1, 5):(3, [1, 2, 3, 5]),
+            (1, 6):(1, [1, 6]),
+            (1, 7):(2, [1, 6, 7]),
+            (1, 8):None,
+            (1, 9):None,
+
+            (2, 3):(1, [2, 3]),
+            (2, 4):(2, [2, 3, 4]),
+            (2, 5):(2, [2, 3, 5]),
+            (2, 6):(2, [2, 1, 6]),
+            (2, 7):(3, [2, 1, 6, 7]),
+            (2, 8):None,
+            (2, 9):None,
+
+            (3, 4):(1, [3, 4]),
+            (3, 5):(1, [3, 5]),
+            (3, 6):(3, [3, 2, 1, 6]),
+            (3, 7):(4, [3, 2, 1, 6, 7]),
+            (3, 8):None,
+            (3, 9):None,
+
+            (4, 5):(1, [4, 5]),
+            (4, 6):(4, [4, 3, 2, 1, 6]),
+            (4, 7):(5, [4, 3, 2, 1, 6, 7]),
+            (4, 8):None,
+            (4, 9):None,
+
+            (5, 6):(4, [5, 3, 2, 1, 6]),
+            (5, 7):(5, [5, 3, 2, 1, 6, 7]),
+            (5, 8):None,
+            (5, 9):None,
+
+            (6, 7):(1, [6, 7]),
+            (6, 8):None,
+            (6, 9):None,
+
+            (7, 8):None,
+            (7, 9):None,
+
+            (8, 9):(1, [8, 9])}
+
+    retval = dict(half)
+    for p in half.keys():
+        rev_p = (p[1], p[0])
+        if half[p] is None:
+            retval[rev_p] = None
+        else:
+            retval[rev_p] = (half[p][0], [x for x in reversed(half[p][1])])
+    return retval
+
+# Creates test data for read_edgelist.
+
+def write_edgelist_of_pairs(elp):
+    f = tempfile.NamedTemporaryFile(mode='w', delete=False)
+    f.writelines(['{0} {1}\n'.format(*pair) for pair in elp])
+    f.close()
+    return f.name
+
+# For checking the results of read_edgelist of the file created by
+# write_edgelist_of_pairs given data from example_edgelist_of_pairs.
+
+def correctly_read_example_edgelist_of_pairs():
+    return {1: [2, 6], 2: [1, 3], 3: [2, 4, 5], 4: [3, 5],
+            5: [3, 4], 6: [1, 7], 7: [6], 8: [9], 9: [8]}
+
+# Assumes one edge per line, a pair of integer node numbers separated by
+# whitespace, that contains both ordered pairs for each undirected edge.
+# Returns a dict with keys the node numbers found in the input, and values
+# the edgelists (list of node numbers) for them.  If check_symmetry, raises
+# ValueError if some pair's reverse is missing, rather than returning what is
+# in effect a directed graph.
+
+def read_edgelist(filename, check_symmetry=False):
+    infile = open(filename, 'r')
+    lines = infile.readlines()
+    infile.close()
+    edgelist = dict()
+    for line in lines:
+        tokens = line.split()
+        from_node = int(tokens[0])
+        to_node = int(tokens[1])
+        curr_list = edgelist.get(from_node)
+        if curr_list:
+            curr_list.append(to_node)
+        else:
+            edgelist[from_node] = [to_node]
+    if check_symmetry:
+        asym = asymmetric_pairs(edgelist)
+        if asym:
+            raise ValueError(('{0} has {1} edges without their reverse, '
+                              + 'for example {2}').format(filename, len(asym),
+                                                          asym[0]))
+    return edgelist
+
+# Returns a sorted list of the (from_node, to_node) pairs in the edgelist dict
+# that occur more times than (to_node, from_node) does.
+
+def asymmetric_pairs(edgelist):
+    counts = dict()
+    for (from_node, el) in edgelist.items():
+        for to_node in el:
+            pair = (from_node, to_node)
+            counts[pair] = counts.get(pair, 0) + 1
+    return sorted([pair for (pair, count) in counts.items()
+                   if count > counts.get((pair[1], pair[0]), 0)])
+
+# Assumes one undirected edge per line, a pair of integer node numbers
+# separated by whitespace, in either order; an edge given more than once, in
+# either order, is kept once.  Returns a dict as read_edgelist does, with both
+# directions of each edge and each edgelist sorted, or if upper_only an
+# UpperTriangleEdgelist storing each edge once.  Raises ValueError if the file
+# holds an odd count of node numbers.
+#
+# The file is parsed in one piece rather than line by line.  With numpy, each
+# edge is packed into an int64 key, smaller contiguous end first, and the
+# keys sorted and deduped; the lists are cut from the sorted keys at offsets
+# from one counting pass over the smaller ends, and the same done for the
+# keys with the ends swapped to give the smaller neighbors.  Without numpy,
+# each edge is appended to both ends' lists, which are then sorted and
+# deduped, and for upper_only split.
+
+def read_undirected_edgelist(filename, upper_only=False):
+    infile = open(filename, 'r')
+    text = infile.read()
+    infile.close()
+    numpy = import_numpy()
+    if numpy is not None:
+        ends = numpy.fromstring(text, dtype=numpy.int64, sep=' ')
+    else:
+        ends = [int(token) for token in text.split()]
+    text = None
+    if len(ends) % 2:
+        raise ValueError('{0} has an odd count of node numbers'.format(
+                filename))
+    if numpy is None:
+        edgelist = _undirected_edgelist(ends)
+        ends = None
+        return _split_edgelist(edgelist) if upper_only else edgelist
+    (nodes, upper, lower_offsets, lower_neighbors) = \
+        _undirected_lists_numpy(ends, numpy)
+    ends = None
+    if upper_only:
+        return UpperTriangleEdgelist(nodes, upper, lower_offsets,
+                                     lower_neighbors)
+    return dict((node, lower_neighbors[lower_offsets[i]:
+                                       lower_offsets[i + 1]].tolist()
+                 + upper[i])
+                for (i, node) in enumerate(nodes))
+
+# Returns the edgelist dict, lists sorted and deduped, of the edges in ends, a
+# flat list of edge end pairs.
+
+def _undirected_edgelist(ends):
+    edgelist = dict([(node, []) for node in set(ends)])
+    pairs = iter(ends)
+    for (node_a, node_b) in zip(pairs, pairs):
+        edgelist[node_a].append(node_b)
+        if node_a != node_b:
+            edgelist[node_b].append(node_a)
+    for (node, el) in edgelist.items():
+        edgelist[node] = sorted(set(el))
+    return edgelist
+
+# Returns an UpperTriangleEdgelist of the edges in edgelist, a dict of sorted
+# lists with both directions of each edge, which it empties.
+
+def _split_edgelist(edgelist):
+    nodes = sorted(edgelist)
+    upper = []
+    lower_offsets = array('q', [0])
+    lower_neighbors = array('q')
+    for node in nodes:
+        el = edgelist.pop(node)
+        i = bisect.bisect_left(el, node)
+        lower_neighbors.extend(el[:i])
+        lower_offsets.append(len(lower_neighbors))
+        upper.append(el[i:])
+    return UpperTriangleEdgelist(nodes, upper, lower_offsets, lower_neighbors)
+
+# Returns the sorted unique values of the int64 numpy array values.
+
+def _sorted_unique_numpy(values, numpy):
+    values = numpy.sort(values)
+    if len(values) == 0:
+        return values
+    return values[numpy.concatenate(([True], values[1:] != values[:-1]))]
+
+# Returns (nodes, upper, lower_offsets, lower_neighbors) for the edges in
+# ends, a flat int64 numpy array of edge end pairs: the sorted node numbers,
+# for each node in that order the sorted list of its neighbors with numbers
+# at least its own, and the CSR arrays described for UpperTriangleEdgelist.
+
+def _undirected_lists_numpy(ends, numpy):
+    nodes = _sorted_unique_numpy(ends, numpy)
+    nr_nodes = len(nodes)
+    ixs = numpy.searchsorted(nodes, ends).reshape(-1, 2)
+    (low, high) = (ixs.min(axis=1), ixs.max(axis=1))
+    ixs = None
+    keys = _sorted_unique_numpy(low * nr_nodes + high, numpy)
+    (low, high) = (keys // nr_nodes, keys % nr_nodes)
+    upper_offsets = numpy.zeros(nr_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(low, minlength=nr_nodes),
+                 out=upper_offsets[1:])
+    (upper_flat, upper_offsets) = (nodes[high].tolist(),
+                                   upper_offsets.tolist())
+    upper = [upper_flat[upper_offsets[i]:upper_offsets[i + 1]]
+             for i in range(0, nr_nodes)]
+    cross = low != high
+    keys = numpy.sort(high[cross] * nr_nodes + low[cross])
+    lower_offsets = numpy.zeros(nr_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(keys // nr_nodes, minlength=nr_nodes),
+                 out=lower_offsets[1:])
+    lower_neighbors = nodes[keys % nr_nodes]
+    return (nodes.tolist(), upper, array('q', lower_offsets.tobytes()),
+            array('q', lower_neighbors.tobytes()))
+
+class UpperTriangleEdgelist(dict):
+    """ Edgelist dict storing for each node only its sorted neighbors with
+        numbers at least its own, as from read_undirected_edgelist, plus a
+        reverse index: nodes, the sorted node numbers, and lower_offsets and
+        lower_neighbors, int64 CSR arrays of each node's smaller neighbors in
+        the order of nodes.  Indexing, get(), values() and items() give whole
+        sorted edgelists, indexing in O(log nr_nodes + degree), so engines and
+        make_contiguous_edgelist see the undirected graph; the smaller
+        neighbors cost 8 bytes each rather than a list entry and an int
+        object.  upper() gives a stored list.
+    """
+    def __init__(self, nodes, upper, lower_offsets, lower_neighbors):
+        dict.__init__(self, zip(nodes, upper))
+        self.nodes = nodes
+        self.lower_offsets = lower_offsets
+        self.lower_neighbors = lower_neighbors
+
+    def upper(self, node):
+        return dict.__getitem__(self, node)
+
+    def _lower_at(self, i):
+        return self.lower_neighbors[self.lower_offsets[i]:
+                                    self.lower_offsets[i + 1]].tolist()
+
+    def lower(self, node):
+        return self._lower_at(bisect.bisect_left(self.nodes, node))
+
+    def __getitem__(self, node):
+        upper = dict.__getitem__(self, node)
+        return self.lower(node) + upper
+
+    def get(self, node, default=None):
+        return self[node] if node in self else default
+
+    def values(self):
+        return [self._lower_at(i) + dict.__getitem__(self, node)
+                for (i, node) in enumerate(self.nodes)]
+
+    def items(self):
+        return list(zip(self.nodes, self.values()))
+
+    # Returns an ordinary edgelist dict with both directions of each edge.
+
+    def full(self):
+        return dict(self.items())
+
+# Given edgelist dict with 'meaningful' edge numbers as keys, creates an
+# edgelist list with contiguous edge numbers starting at 0, a list to translate
+# from contiguous to meaningful edge numbers, and a dict to translate backwards.
+
+def make_contiguous_edgelist(edgelist):
+    nr_nodes = len(edgelist.keys())
+    edgelist_array = [None] * nr_nodes
+    node_ix_to_nr = [None] * nr_nodes
+    node_nr_to_ix = {}
+    i = 0
+    for node in edgelist.keys():
+        node_ix_to_nr[i] = node
+        node_nr_to_ix[node] = i
+        i = i + 1
+    i = 0
+    for (node, el) in edgelist.items():
+        edgelist_array[i] = [node_nr_to_ix[edge_node] for edge_node in el]
+        i = i + 1
+    return (edgelist, edgelist_array, node_ix_to_nr, node_nr_to_ix)
+
+# Given an edgelist list with contiguous node numbers starting at 0, returns a
+# new one with each neighbor list sorted by decreasing degree, ties by
+# increasing node number, so that searches meet the hubs first.
+
+def sort_edgelist_by_degree(edgelist_array):
+    def key(node):
+        return (-len(edgelist_array[node]), node)
+    return [sorted(el, key=key) for el in edgelist_array]
+
+# Constructs a given depth of the tree, adding to the list nodelist and
+# dict edgelist.
+
+def construct_tree_level(degree, max_depth, curr_depth, nodelist, edgelist):
+    nr_digits_per_level = int(math.ceil(math.log10(degree)))
+    depth_factor = 10**(curr_depth * nr_digits_per_level)
+    new_nodelist = []
+    for n in nodelist:  # node is tuple (node_nr, depth)
+        if n[1] + 1 == curr_depth:
+            # root has no parent so needs one more child
+            nr_children = degree - 1 if curr_depth > 1 else degree
+            for i in range(0, nr_children):
+                node_nr = n[0]
+                new_node_nr = node_nr + (i + 1) * depth_factor
+                new_node = (new_node_nr, curr_depth)
+                new_nodelist.append(new_node)
+
+                old_list = edgelist.get(node_nr)
+                if old_list:
+                    old_list.append(new_node_nr)
+                else:
+                    edgelist[node_nr] = [new_node_nr]
+
+                # Used to have the following, but coverage said the first
+                # condition never occurred.  If the rest of the logic here and
+                # in callers is ok, could just use what's after else.
+                # However, probably little cost.
+
+                new_list = edgelist.get(new_node_nr)
+                if new_list:
+                    new_list.append(node_nr)
+                else:
+                    edgelist[new_node_nr] = [node_nr]
+
+    nodelist += new_nodelist
+
+# degree must be at least 2.  The degree of the leaves will be 1.
+# Returns per make_contiguous_edgelist, an edgelist dict with 'meaningful' edge
+# numbers as keys, as well as an edgelist list with contiguous edge numbers
+# starting at 0, a list to translate from contiguous to meaningful edge numbers,
+# and a dict to translate backwards.
+
+def construct_tree_edgelist(degree, max_depth):
+    nodelist   = [(1, 0)]
+    edgelist   = {}
+    for depth in range(1, max_depth + 1):
+        construct_tree_level(degree, max_depth, depth, nodelist, edgelist)
+    return make_contiguous_edgelist(edgelist)
+
+# Returns the number of nodes in a complete arity-ary tree of the given
+# max_depth, arity at least 1.
+
+def kary_tree_nr_nodes(arity, max_depth):
+    if arity == 1:
+        return max_depth + 1
+    return (arity**(max_depth + 1) - 1) // (arity - 1)
+
+# Returns (offsets, neighbors) CSR arrays, as from csr.make_csr_edgelist, for
+# the complete arity-ary tree of the given max_depth, with nodes numbered as in
+# a heap: root 0, the children of node i are arity * i + 1 through
+# arity * i + arity, and the parent of node i > 0 is (i - 1) // arity.  Each
+# neighbor list is the parent, if any, then the children.  Unlike
+# construct_tree_edgelist, the root has the same number of children as the
+# other internal nodes, and no translation tables are needed.
+
+def construct_kary_tree_csr(arity, max_depth):
+    nr_nodes = kary_tree_nr_nodes(arity, max_depth)
+    nr_internal = kary_tree_nr_nodes(arity, max_depth - 1) if max_depth else 0
+    offsets = array('q', [0]) * (nr_nodes + 1)
+    neighbors = array('i')
+    total = 0
+    for node in range(0, nr_nodes):
+        if node > 0:
+            neighbors.append((node - 1) // arity)
+            total += 1
+        if node < nr_internal:
+            neighbors.extend(range(arity * node + 1, arity * node + arity + 1))
+            total += arity
+        offsets[node + 1] = total
+    return (offsets, neighbors)
+
+# nr_nodes must be at least 2 and fraction_edges between 0 and 1 inclusive
+# (edge cases of 0.0 and 1.0 not tested).
+# fraction_edges is the desired fraction of the possible
+# (nr_nodes) * (nr_nodes - 1) / 2 edges.
+
+def construct_random_graph(nr_nodes, fraction_edges):
+    nodelist = range(0, nr_nodes)
+    desired_nr_edges = int(round(fraction_edges * nr_nodes * (nr_nodes - 1)))
+    edgelist = {}
+    nr_edges = 0
+
+    while (nr_edges < desired_nr_edges):
+        from_node = random.randint(0, nr_nodes - 1)
+        to_node = random.randint(0, nr_nodes - 1)
+
+        from_list = edgelist.get(from_node)
+        to_list = edgelist.get(to_node)
+        if from_list:
+            if to_node not in from_list:  # our logic implies also the reverse
+                from_list.append(to_node)
+                if to_list:
+                    to_list.append(from_node)
+                else:
+                    edgelist[to_node] = [from_node]
+                nr_edges = nr_edges + 2
+        else:
+            edgelist[from_node] = [to_node]
+            if to_list:
+                to_list.append(from_node)
+            else:
+                edgelist[to_node] = [from_node]
+            nr_edges = nr_edges + 2
+
+    return make_contiguous_edgelist(edgelist)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# hubs.py rev 19 Oct 2026
+# Bidirectional bfs that uses a precomputed set of high degree hubs to bound
+# the search, for power-law graphs where most shortest paths pass through hubs.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+import math
+
+from .gendata import sort_edgelist_by_degree
+
+class HubEdgelist(list):
+    """ Edgelist list with contiguous node numbers, each neighbor list sorted
+        by decreasing degree (so any hubs come first), plus the hub index:
+        hubs, the nr_hubs highest degree nodes; hub_ix, a dict from hub node
+        to its position in hubs; and hub_adj, where bit j of hub_adj[i] is set
+        if hubs[i] and hubs[j] are adjacent.
+    """
+    pass
+
+# Given an edgelist list with contiguous node numbers starting at 0, returns a
+# HubEdgelist for it with nr_hubs hubs, by default the square root of the
+# number of nodes, rounded up, so the hub bitmaps take O(nr_nodes) bits.
+
+def make_hub_edgelist(edgelist_array, nr_hubs=None):
+    nr_nodes = len(edgelist_array)
+    if nr_hubs is None:
+        nr_hubs = int(math.ceil(math.sqrt(nr_nodes)))
+    hub_el = HubEdgelist(sort_edgelist_by_degree(edgelist_array))
+    by_degree = sorted(range(0, nr_nodes),
+                       key=lambda node: (-len(edgelist_array[node]), node))
+    hub_el.hubs = [node for node in by_degree[:nr_hubs]
+                   if edgelist_array[node]]
+    hub_el.hub_ix = dict((hub, i) for (i, hub) in enumerate(hub_el.hubs))
+    hub_el.hub_adj = [0] * len(hub_el.hubs)
+    for (i, hub) in enumerate(hub_el.hubs):
+        bits = 0
+        for node in hub_el[hub]:
+            j = hub_el.hub_ix.get(node)
+            if j is None:
+                break  # hubs come first in the sorted list
+            bits |= 1 << j
+        hub_el.hub_adj[i] = bits
+    return hub_el
+
+# Returns (bits0, bits1), bitmaps of the hubs at distance 0 (node itself) and
+# 1 from node, scanning only the hub prefix of node's neighbor list.
+
+def _near_hubs(node, hub_el):
+    hub_ix = hub_el.hub_ix
+    bits0 = 1 << hub_ix[node] if node in hub_ix else 0
+    bits1 = 0
+    for new_node in hub_el[node]:
+        j = hub_ix.get(new_node)
+        if j is None:
+            break
+        bits1 |= 1 << j
+    return (bits0, bits1)
+
+def _lowest_bit(bits):
+    return (bits & -bits).bit_length() - 1
+
+# Returns (path_len, path) for the shortest path from root to target of the
+# form root, [hub], [hub], target, with at most two hubs, or None if none.
+
+def hub_path(root, target, hub_el):
+    (r_bits0, r_bits1) = _near_hubs(root, hub_el)
+    (t_bits0, t_bits1) = _near_hubs(target, hub_el)
+    best = None
+    for (r_dist, r_bits) in ((0, r_bits0), (1, r_bits1)):
+        while r_bits:
+            i = _lowest_bit(r_bits)
+            r_bits &= r_bits - 1
+            for (hop, i_bits) in ((0, 1 << i), (1, hub_el.hub_adj[i])):
+                for (t_dist, t_bits) in ((0, t_bits0), (1, t_bits1)):
+                    path_len = r_dist + hop + t_dist
+                    if (i_bits & t_bits) and (best is None
+                                              or path_len < best[0]):
+                        j = _lowest_bit(i_bits & t_bits)
+                        best = (path_len, (r_dist, i, hop, j, t_dist))
+    if best is None:
+        return None
+    (path_len, (r_dist, i, hop, j, t_dist)) = best
+    path = [root] if r_dist else []
+    path.append(hub_el.hubs[i])
+    if hop:
+        path.append(hub_el.hubs[j])
+    if t_dist:
+        path.append(target)
+    return (path_len, path)
+
+# Finds shortest path from root to target given a HubEdgelist, as bfs2 does,
+# but first finds the shortest path through at most two hubs, and stops the
+# search as soon as the levels done show no shorter path exists: if r_depth
+# and t_depth levels have been done from each end without meeting, any path
+# has length more than r_depth + t_depth.  Given a plain edgelist list,
+# behaves as bfs2.
+# Returns (path_len, path), path given as list of nodes, or None if no path.
+
+def bfs_hub(root, target, edgelist):
+    if (root == target):
+        return (0, [root])
+
+    via_hubs = None
+    if isinstance(edgelist, HubEdgelist):
+        via_hubs = hub_path(root, target, edgelist)
+
+    parent_r = { root:None }
+    parent_t = { target:None }
+    r_level_nodes = [root]
+    t_level_nodes = [target]
+    r_depth = 0
+    t_depth = 0
+
+    match_node = None
+
+    while (match_node is None) and r_level_nodes and t_level_nodes:
+        if via_hubs is not None and r_depth + t_depth + 1 >= via_hubs[0]:
+            return via_hubs
+        if len(r_level_nodes) <= len(t_level_nodes):
+            level_nodes = r_level_nodes
+            r_level_nodes = []
+            r_depth += 1
+            for node in level_nodes:
+                for new_node in edgelist[node]:
+                    if new_node not in parent_r:
+                        parent_r[new_node] = node
+                        r_level_nodes.append(new_node)
+                    if new_node in parent_t:
+                        match_node = new_node
+                        break
+                if match_node is not None:
+                    break
+        else:
+            level_nodes = t_level_nodes
+            t_level_nodes = []
+            t_depth += 1
+            for node in level_nodes:
+                for new_node in edgelist[node]:
+                    if new_node not in parent_t:
+                        parent_t[new_node] = node
+                        t_level_nodes.append(new_node)
+                    if new_node in parent_r:
+                        match_node = new_node
+                        break
+                if match_node is not None:
+                    break
+
+    if match_node is not None:
+        accum = [match_node]
+        p = parent_r[match_node]
+        while p is not None:
+            accum.append(p)
+            p = parent_r[p]
+        accum.reverse()
+        p = parent_t[match_node]
+        while p is not None:
+            accum.append(p)
+            p = parent_t[p]
+        return (len(accum) - 1, accum)
+    else:
+        return via_hubs
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# optional.py rev 19 Oct 2026
+# Imports optional accelerators on first use rather than at module load, so
+# that importing the search engines stays fast when they aren't needed.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+_numpy = None
+
+# Returns the numpy module, or None if it isn't installed.  Only the first
+# call tries the import.
+
+def import_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# parbuild.py rev 19 Oct 2026
+# Builds the CSR graph from an edge file in parallel: byte ranges of the file
+# are parsed in a process pool, without the intermediate dict of lists that
+# gendata.read_edgelist and make_contiguous_edgelist make.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import bisect
+import heapq
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+import os
+
+from .csr      import CSREdgelist, NodeNrToIx
+from .shmgraph import attach_segment
+
+from .optional import import_numpy
+
+# The file format is that of gendata.read_edgelist.  Four parallel passes:
+# the first collects each chunk's node numbers, sorted and unique.  The second
+# is a sample sort merge of those: splitters sampled from the chunk lists
+# divide the node numbers into ranges, and each worker merges and dedupes the
+# pieces of all the chunk lists in one range, so the global sorted list of
+# node numbers is the ranges' lists one after another, and contiguous numbers
+# are positions in it (an order that differs from make_contiguous_edgelist's,
+# which is that of first appearance).  That list goes into a shared memory
+# segment, which the workers attach to rather than each getting a copy.  The
+# last two passes are a counting sort of the edges by from node: the third has
+# each worker translate its chunk's edges to contiguous numbers by binary
+# search in the shared list and count them by from node, over the range of
+# from nodes the chunk has (narrow if the file is sorted).  From the counts
+# the parent works out the CSR offsets and where in neighbors each chunk's
+# edges from each node go, and in the fourth pass the workers translate their
+# chunks again and write the edges there, into a shared neighbors array, in
+# file order.  No pass gathers the edges in one process.
+
+# Returns nr_chunks (start, end) byte ranges covering the file.  A line
+# belongs to the chunk containing its first byte.
+
+def _chunk_ranges(filename, nr_chunks):
+    size = os.path.getsize(filename)
+    bounds = [size * i // nr_chunks for i in range(0, nr_chunks + 1)]
+    return [(filename, bounds[i], bounds[i + 1]) for i in range(0, nr_chunks)]
+
+# Yields the (from_node, to_node) pairs of the lines starting in the chunk.
+
+def _chunk_pairs(chunk):
+    (filename, start, end) = chunk
+    infile = open(filename, 'rb')
+    if start > 0:
+        infile.seek(start - 1)
+        infile.readline()  # finish the line the previous chunk owns
+    pos = infile.tell()
+    while pos < end:
+        line = infile.readline()
+        if not line:
+            break
+        pos += len(line)
+        tokens = line.split()
+        if tokens:
+            yield (int(tokens[0]), int(tokens[1]))
+    infile.close()
+
+def _chunk_nodes(chunk):
+    nodes = set()
+    for (from_node, to_node) in _chunk_pairs(chunk):
+        nodes.add(from_node)
+        nodes.add(to_node)
+    return array('q', sorted(nodes))
+
+# Returns the sorted unique union of the sorted arrays in pieces.
+
+def _merge_unique(pieces):
+    numpy = import_numpy()
+    if numpy is not None:
+        merged = numpy.unique(numpy.concatenate(
+                [numpy.frombuffer(piece, numpy.int64) for piece in pieces]
+                + [numpy.zeros(0, numpy.int64)]))
+        return array('q', merged.tobytes())
+    merged = array('q')
+    for nr in heapq.merge(*pieces):
+        if not merged or nr != merged[-1]:
+            merged.append(nr)
+    return merged
+
+# Splits the sorted chunk node arrays into nr_parts lists of pieces by value
+# range, at splitters sampled evenly from each array.
+
+def _split_by_range(chunk_nodes, nr_parts):
+    samples = []
+    for nodes in chunk_nodes:
+        step = max(1, len(nodes) // nr_parts)
+        samples.extend(nodes[step - 1::step])
+    samples.sort()
+    splitters = [samples[len(samples) * i // nr_parts]
+                 for i in range(1, nr_parts)] if samples else []
+    parts = []
+    for i in range(0, len(splitters) + 1):
+        part = []
+        for nodes in chunk_nodes:
+            start = 0 if i == 0 else bisect.bisect_left(nodes,
+                                                        splitters[i - 1])
+            end = (len(nodes) if i == len(splitters)
+                   else bisect.bisect_left(nodes, splitters[i]))
+            if start < end:
+                part.append(nodes[start:end])
+        parts.append(part)
+    return parts
+
+# Segments attached in this worker process: name: (SharedMemory, view).
+
+_segments = dict()
+
+# Returns a memoryview, as length items of typecode, of the shared memory
+# segment with the given name, attaching to it the first time in this process.
+
+def _shared_view(name, typecode, length):
+    if name not in _segments:
+        shm = attach_segment(name)
+        size = length * array(typecode).itemsize
+        _segments[name] = (shm, shm.buf[:size].cast(typecode))
+    return _segments[name][1]
+
+# Returns a new shared memory segment holding a copy of arr, an array.
+
+def _share_array(arr):
+    raw = memoryview(arr).cast('B')
+    shm = shared_memory.SharedMemory(create=True, size=max(len(raw), 1))
+    shm.buf[:len(raw)] = raw
+    raw.release()
+    return shm
+
+# Returns the contiguous numbers of the chunk's edges, by binary search in
+# the shared sorted node numbers: with numpy, an (nr_edges, 2) int64 array;
+# without, a list of (from_ix, to_ix) pairs.
+
+def _chunk_ix_pairs(chunk, ids_name, nr_nodes, numpy):
+    ids = _shared_view(ids_name, 'q', nr_nodes)
+    if numpy is not None:
+        pairs = numpy.array(list(_chunk_pairs(chunk)),
+                            numpy.int64).reshape(-1, 2)
+        return numpy.searchsorted(numpy.frombuffer(ids, numpy.int64), pairs)
+    return [(bisect.bisect_left(ids, from_node),
+             bisect.bisect_left(ids, to_node))
+            for (from_node, to_node) in _chunk_pairs(chunk)]
+
+# Returns (lo, counts): counts[i] is the number of the chunk's edges from
+# contiguous node lo + i, for the range of from nodes the chunk has.
+
+def _chunk_counts(args):
+    (chunk, ids_name, nr_nodes) = args
+    numpy = import_numpy()
+    ix_pairs = _chunk_ix_pairs(chunk, ids_name, nr_nodes, numpy)
+    if len(ix_pairs) == 0:
+        return (0, array('q'))
+    if numpy is not None:
+        from_ix = ix_pairs[:, 0]
+        lo = int(from_ix.min())
+        counts = numpy.bincount(from_ix - lo).astype(numpy.int64)
+        return (lo, array('q', counts.tobytes()))
+    lo = min(from_ix for (from_ix, to_ix) in ix_pairs)
+    hi = max(from_ix for (from_ix, to_ix) in ix_pairs)
+    counts = array('q', [0]) * (hi - lo + 1)
+    for (from_ix, to_ix) in ix_pairs:
+        counts[from_ix - lo] += 1
+    return (lo, counts)
+
+# Writes the chunk's to nodes into the shared neighbors array, each edge from
+# node lo + i going at starts[i] and the positions after it, in file order.
+
+def _chunk_fill(args):
+    (chunk, ids_name, nr_nodes, neighbors_name, nr_neighbors, lo,
+     starts) = args
+    numpy = import_numpy()
+    ix_pairs = _chunk_ix_pairs(chunk, ids_name, nr_nodes, numpy)
+    neighbors = _shared_view(neighbors_name, 'i', nr_neighbors)
+    if numpy is not None:
+        order = numpy.argsort(ix_pairs[:, 0], kind='stable')
+        from_ix = ix_pairs[order, 0]
+        # Each edge's rank among the chunk's edges from the same node.
+        rank = (numpy.arange(len(from_ix))
+                - numpy.searchsorted(from_ix, from_ix))
+        positions = numpy.frombuffer(starts, numpy.int64)[from_ix - lo] + rank
+        numpy.frombuffer(neighbors, numpy.int32)[positions] = \
+            ix_pairs[order, 1]
+        return
+    starts = array('q', starts)
+    for (from_ix, to_ix) in ix_pairs:
+        neighbors[starts[from_ix - lo]] = to_ix
+        starts[from_ix - lo] += 1
+
+# Given the (lo, counts) of each chunk, returns (offsets, chunk_starts): the
+# CSR offsets, and for each chunk the array of positions in neighbors where
+# its edges from nodes lo, lo + 1, ... begin, after those of earlier chunks.
+
+def _placement(chunk_counts, nr_nodes):
+    numpy = import_numpy()
+    if numpy is not None:
+        offsets = numpy.zeros(nr_nodes + 1, numpy.int64)
+        for (lo, counts) in chunk_counts:
+            offsets[lo + 1:lo + 1 + len(counts)] += numpy.frombuffer(
+                counts, numpy.int64)
+        numpy.cumsum(offsets, out=offsets)
+        fill = offsets[:nr_nodes].copy()
+        chunk_starts = []
+        for (lo, counts) in chunk_counts:
+            end = lo + len(counts)
+            chunk_starts.append(array('q', fill[lo:end].tobytes()))
+            fill[lo:end] += numpy.frombuffer(counts, numpy.int64)
+        return (array('q', offsets.tobytes()), chunk_starts)
+    offsets = array('q', [0]) * (nr_nodes + 1)
+    for (lo, counts) in chunk_counts:
+        for i in range(0, len(counts)):
+            offsets[lo + 1 + i] += counts[i]
+    for ix in range(0, nr_nodes):
+        offsets[ix + 1] += offsets[ix]
+    fill = offsets[:nr_nodes]
+    chunk_starts = []
+    for (lo, counts) in chunk_counts:
+        chunk_starts.append(fill[lo:lo + len(counts)])
+        for i in range(0, len(counts)):
+            fill[lo + i] += counts[i]
+    return (offsets, chunk_starts)
+
+# Given a file of edges in the format gendata.read_edgelist reads, returns
+# (edgelist, node_ix_to_nr, node_nr_to_ix): a CSREdgelist with contiguous node
+# numbers, an array of the meaningful node numbers in increasing order, which
+# is also the translation from contiguous ones, and a NodeNrToIx to translate
+# backwards.  Nodes that only appear second in a pair get empty lists.  Uses
+# nr_workers processes (default os.cpu_count()) and as many chunks as given by
+# nr_chunks (default 4 per worker).
+
+def read_csr_edgelist_parallel(filename, nr_workers=None, nr_chunks=None):
+    if nr_workers is None:
+        nr_workers = os.cpu_count() or 1
+    if nr_chunks is None:
+        nr_chunks = 4 * nr_workers
+    chunks = _chunk_ranges(filename, nr_chunks)
+
+    if os.name == 'posix':
+        # Workers share the tracker of the segments only if it's running
+        # before they start; otherwise each starts its own, which unlinks
+        # the segments it saw when the worker exits.
+        resource_tracker.ensure_running()
+    pool = multiprocessing.Pool(nr_workers)
+    segments = []
+    try:
+        chunk_nodes = pool.map(_chunk_nodes, chunks)
+        parts = _split_by_range(chunk_nodes, nr_workers)
+        chunk_nodes = None
+        node_ix_to_nr = array('q')
+        for merged in pool.map(_merge_unique, parts):
+            node_ix_to_nr.extend(merged)
+        parts = None
+        nr_nodes = len(node_ix_to_nr)
+        segments.append(_share_array(node_ix_to_nr))
+        ids_name = segments[-1].name
+
+        chunk_counts = pool.map(_chunk_counts, [(chunk, ids_name, nr_nodes)
+                                                for chunk in chunks])
+        (offsets, chunk_starts) = _placement(chunk_counts, nr_nodes)
+        nr_neighbors = offsets[nr_nodes]
+        segments.append(shared_memory.SharedMemory(
+                create=True, size=max(4 * nr_neighbors, 1)))
+        neighbors_name = segments[-1].name
+        pool.map(_chunk_fill, [(chunk, ids_name, nr_nodes, neighbors_name,
+                                nr_neighbors, lo, starts)
+                               for (chunk, (lo, counts), starts)
+                               in zip(chunks, chunk_counts, chunk_starts)])
+        chunk_counts = chunk_starts = None
+        neighbors = array('i')
+        neighbors.frombytes(segments[-1].buf[:4 * nr_neighbors])
+    finally:
+        pool.close()
+        pool.join()
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    node_nr_to_ix = NodeNrToIx(node_ix_to_nr, array('q', range(0, nr_nodes)))
+    return (CSREdgelist(offsets, neighbors), node_ix_to_nr, node_nr_to_ix)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# partition.py rev 19 Oct 2026
+# Splits a contiguous graph into shards, each saved with its boundary tables,
+# and searches it bidirectionally with one worker process per shard, each
+# expanding its own part of the frontiers and passing the nodes it reaches in
+# other shards on through the coordinator, over pipes.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+from collections import deque
+import multiprocessing
+import pickle
+
+# Grows nr_shards partitions of an edgelist list with contiguous node numbers
+# by bfs, each from the lowest numbered node not yet assigned, until it holds
+# its share of the nodes; a partition whose component runs out continues from
+# the next unassigned node.  Returns owner, an array giving each node's shard.
+
+def partition_bfs(edgelist_array, nr_shards):
+    nr_nodes = len(edgelist_array)
+    owner = array('i', [-1]) * nr_nodes
+    next_seed = 0
+    for shard in range(0, nr_shards):
+        quota = (nr_nodes * (shard + 1)) // nr_shards - \
+            (nr_nodes * shard) // nr_shards
+        queue = deque()
+        while quota > 0:
+            if not queue:
+                while owner[next_seed] >= 0:
+                    next_seed += 1
+                owner[next_seed] = shard
+                quota -= 1
+                queue.append(next_seed)
+                continue
+            node = queue.popleft()
+            for new_node in edgelist_array[node]:
+                if quota > 0 and owner[new_node] < 0:
+                    owner[new_node] = shard
+                    quota -= 1
+                    queue.append(new_node)
+    return owner
+
+class Shard(object):
+    """ The part of a graph owned by one shard: nodes, the owned (global)
+        node numbers in increasing order; offsets and neighbors, CSR arrays
+        of their neighbor lists, in global numbers; boundary, the owned nodes
+        with a neighbor in another shard; and remote_owner, a dict from each
+        such neighbor to its shard.
+    """
+    def __init__(self, shard, nr_shards, nodes, offsets, neighbors, boundary,
+                 remote_owner):
+        self.shard = shard
+        self.nr_shards = nr_shards
+        self.nodes = nodes
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.boundary = boundary
+        self.remote_owner = remote_owner
+        self.local_ix = dict((node, i) for (i, node) in enumerate(nodes))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['local_ix']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.local_ix = dict((node, i) for (i, node) in enumerate(self.nodes))
+
+    def __getitem__(self, node):
+        i = self.local_ix[node]
+        return self.neighbors[self.offsets[i]:self.offsets[i + 1]]
+
+# Returns the Shard objects for the partition given by owner.
+
+def make_shards(edgelist_array, owner, nr_shards):
+    shards = []
+    for shard in range(0, nr_shards):
+        nodes = array('i', [node for node in range(0, len(owner))
+                            if owner[node] == shard])
+        offsets = array('q', [0])
+        neighbors = array('i')
+        boundary = array('i')
+        remote_owner = dict()
+        for node in nodes:
+            el = edgelist_array[node]
+            neighbors.extend(el)
+            offsets.append(len(neighbors))
+            on_boundary = False
+            for new_node in el:
+                if owner[new_node] != shard:
+                    remote_owner[new_node] = owner[new_node]
+                    on_boundary = True
+            if on_boundary:
+                boundary.append(node)
+        shards.append(Shard(shard, nr_shards, nodes, offsets, neighbors,
+                            boundary, remote_owner))
+    return shards
+
+# Partitions the graph, saves each shard to prefix.<shard>.shard and the owner
+# array to prefix.owner, and returns the list of shard filenames.
+
+def save_shards(edgelist_array, nr_shards, prefix):
+    owner = partition_bfs(edgelist_array, nr_shards)
+    outfile = open(prefix + '.owner', 'wb')
+    owner.tofile(outfile)
+    outfile.close()
+    filenames = []
+    for shard in make_shards(edgelist_array, owner, nr_shards):
+        filename = '{0}.{1}.shard'.format(prefix, shard.shard)
+        outfile = open(filename, 'wb')
+        pickle.dump(shard, outfile, pickle.HIGHEST_PROTOCOL)
+        outfile.close()
+        filenames.append(filename)
+    return filenames
+
+def load_shard(filename):
+    infile = open(filename, 'rb')
+    shard = pickle.load(infile)
+    infile.close()
+    return shard
+
+# Search state of one shard worker for bidirectional search: for each side
+# (0 the root's, 1 the target's), visited, a dict from each owned node reached
+# to (parent, depth), and level, the owned nodes of the side's frontier.
+
+class _ShardState(object):
+    def __init__(self, shard):
+        self.shard = shard
+        self.boundary = set(shard.boundary)
+        self.visited = (dict(), dict())
+        self.level = ([], [])
+
+    def start(self, seeds):
+        self.visited = (dict(), dict())
+        self.level = ([], [])
+        for (side, node) in seeds:
+            self.visited[side][node] = (None, 0)
+            self.level[side].append(node)
+
+    # Marks node, owned, reached on side from parent, if it is new there.
+    # Returns the path length if it meets the other side, else None.
+
+    def _reach(self, side, node, parent, depth, next_level):
+        if node in self.visited[side]:
+            return None
+        self.visited[side][node] = (parent, depth)
+        next_level.append(node)
+        other = self.visited[1 - side].get(node)
+        return None if other is None else depth + other[1]
+
+    # Expands the side's frontier by a level.  Neighbors owned here are
+    # marked at once; the others, found through remote_owner, only for the
+    # boundary nodes, are returned as a dict from shard to (node, parent,
+    # depth) triples for the coordinator to pass on.  Returns (outgoing,
+    # number of nodes newly reached here, best meeting), best meeting the
+    # (path length, node) of the shortest path found through a newly
+    # reached node, or None.
+
+    def expand(self, side):
+        shard = self.shard
+        visited = self.visited[side]
+        next_level = []
+        outgoing = dict()
+        best = None
+        for node in self.level[side]:
+            depth = visited[node][1] + 1
+            on_boundary = node in self.boundary
+            for new_node in shard[node]:
+                if on_boundary and new_node not in shard.local_ix:
+                    outgoing.setdefault(shard.remote_owner[new_node],
+                                        []).append((new_node, node, depth))
+                    continue
+                path_len = self._reach(side, new_node, node, depth,
+                                       next_level)
+                if path_len is not None and (best is None or
+                                             (path_len, new_node) < best):
+                    best = (path_len, new_node)
+        self.level = ((next_level, self.level[1]) if side == 0
+                      else (self.level[0], next_level))
+        return (outgoing, len(next_level), best)
+
+    # Marks the owned nodes sent by other shards during expand of side.
+    # Returns (number newly reached, best meeting) as expand does.
+
+    def receive(self, side, triples):
+        next_level = self.level[side]
+        nr_before = len(next_level)
+        best = None
+        for (node, parent, depth) in triples:
+            path_len = self._reach(side, node, parent, depth, next_level)
+            if path_len is not None and (best is None or
+                                         (path_len, node) < best):
+                best = (path_len, node)
+        return (len(next_level) - nr_before, best)
+
+    # Follows side's parent links from node while they stay in this shard.
+    # Returns (nodes, node first, next node in another shard or None).
+
+    def chain(self, side, node):
+        accum = []
+        visited = self.visited[side]
+        while node is not None and node in visited:
+            accum.append(node)
+            node = visited[node][0]
+        return (accum, node)
+
+# Worker process loop: each request is a tuple (command, arguments...),
+# answered with the result of the _ShardState method, or for 'degree' the
+# node's degree; None ends the loop.
+
+def _shard_worker(filename, conn):
+    state = _ShardState(load_shard(filename))
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        (command, args) = (request[0], request[1:])
+        if command == 'degree':
+            conn.send(len(state.shard[args[0]]))
+        else:
+            conn.send(getattr(state, command)(*args))
+    conn.close()
+
+class ShardedSearch(object):
+    """ Coordinator for a graph saved by save_shards with the given prefix
+        and number of shards: starts a worker process per shard, connected by
+        a pipe.  The workers hold the search state, expand their own parts of
+        each frontier, and hand back only the newly reached nodes owned by
+        other shards, which the coordinator routes to their owners; it keeps
+        just the owner array and the frontier sizes per shard.  The
+        connections are multiprocessing Connection objects, so workers on
+        other hosts could be reached through multiprocessing.connection in
+        place of the local pipes.
+    """
+    def __init__(self, prefix, nr_shards):
+        infile = open(prefix + '.owner', 'rb')
+        self.owner = array('i')
+        self.owner.frombytes(infile.read())
+        infile.close()
+        self.conns = []
+        self.processes = []
+        for shard in range(0, nr_shards):
+            (conn, child_conn) = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_worker,
+                args=('{0}.{1}.shard'.format(prefix, shard), child_conn))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.conns = []
+        self.processes = []
+
+    # Sends each shard in requests (a dict from shard to request) its
+    # request, all before waiting, and returns a dict of the answers.
+
+    def _ask(self, requests):
+        for (shard, request) in requests.items():
+            self.conns[shard].send(request)
+        return dict((shard, self.conns[shard].recv()) for shard in requests)
+
+    def _degree(self, node):
+        return self._ask({self.owner[node]: ('degree', node)}).popitem()[1]
+
+    # Returns the nodes on side's parent links from node back to its end.
+
+    def _path_half(self, side, node):
+        accum = []
+        while node is not None:
+            (nodes, node) = self._ask(
+                {self.owner[node]: ('chain', side, node)}).popitem()[1]
+            accum.extend(nodes)
+        return accum
+
+    # Finds shortest path from root to target, swapping them by degree as
+    # bfs2 does, and moving from both ends toward the middle a whole level at
+    # a time, the smaller side first.  As in batch.bfs_csr_numpy, the meeting
+    # taken is the one giving the shortest path among all found in the level,
+    # so the path length is bfs2's though the path may differ.
+    # Returns (path_len, path), path given as list of nodes, or None if no
+    # path.
+
+    def bfs(self, root, target):
+        if (root == target):
+            return (0, [root])
+
+        if self._degree(root) > self._degree(target):
+            (root, target) = (target, root)
+
+        seeds = dict((shard, []) for shard in range(0, len(self.conns)))
+        seeds[self.owner[root]].append((0, root))
+        seeds[self.owner[target]].append((1, target))
+        self._ask(dict((shard, ('start', shard_seeds))
+                       for (shard, shard_seeds) in seeds.items()))
+        level_sizes = ({self.owner[root]: 1}, {self.owner[target]: 1})
+
+        best = None
+        while best is None and level_sizes[0] and level_sizes[1]:
+            side = 0 if (sum(level_sizes[0].values())
+                         <= sum(level_sizes[1].values())) else 1
+            sizes = dict()
+            incoming = dict()
+            answers = self._ask(dict((shard, ('expand', side))
+                                     for shard in level_sizes[side]))
+            for (shard, (outgoing, nr_new, shard_best)) in answers.items():
+                sizes[shard] = nr_new
+                if shard_best is not None and (best is None
+                                               or shard_best < best):
+                    best = shard_best
+                for (dest, triples) in outgoing.items():
+                    incoming.setdefault(dest, []).extend(triples)
+            answers = self._ask(dict((dest, ('receive', side, triples))
+                                     for (dest, triples) in incoming.items()))
+            for (shard, (nr_new, shard_best)) in answers.items():
+                sizes[shard] = sizes.get(shard, 0) + nr_new
+                if shard_best is not None and (best is None
+                                               or shard_best < best):
+                    best = shard_best
+            level_sizes[side].clear()
+            level_sizes[side].update((shard, nr) for (shard, nr)
+                                     in sizes.items() if nr)
+
+        if best is None:
+            return None
+        match_node = best[1]
+        accum = self._path_half(0, match_node)
+        accum.reverse()
+        accum.extend(self._path_half(1, match_node)[1:])
+        return (len(accum) - 1, accum)
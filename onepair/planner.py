@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# planner.py rev 19 Oct 2026
+# Registry of search engines, each declaring the graph representation it
+# searches and its capabilities, and a planner that picks engines for a graph
+# from its statistics, converting the graph to each representation at most
+# once.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+from collections import deque
+import importlib
+import os
+
+from .optional import import_numpy
+
+# Representations.  Each is made from the edgelist list with contiguous node
+# numbers (representation 'list') by a converter called as
+# converter(edgelist_array, planner), which may ask the planner for another
+# representation to build on, so that, for instance, the numpy arrays share the
+# CSR conversion.  A representation needing cleanup has a function for it,
+# called with the converted graph when the planner is closed.
+
+representations = dict()
+
+def register_representation(name, converter, cleanup=None):
+    representations[name] = (converter, cleanup)
+
+def _import(module_name, attr):
+    return getattr(importlib.import_module('.' + module_name, __package__),
+                   attr)
+
+def _to_dict(edgelist_array, planner):
+    return dict(enumerate(edgelist_array))
+
+def _to_csr(edgelist_array, planner):
+    csr = importlib.import_module('.csr', __package__)
+    return csr.CSREdgelist(*csr.make_csr_edgelist(edgelist_array))
+
+def _to_compressed(edgelist_array, planner):
+    return _import('compress', 'make_compressed_edgelist')(edgelist_array)
+
+def _to_hub(edgelist_array, planner):
+    return _import('hubs', 'make_hub_edgelist')(edgelist_array)
+
+def _to_numpy(edgelist_array, planner):
+    numpy = import_numpy()
+    if numpy is None:
+        raise ImportError('numpy is not installed')
+    csr_el = planner.graph('csr')
+    return (numpy.asarray(csr_el.offsets), numpy.asarray(csr_el.neighbors))
+
+def _to_tree_index(edgelist_array, planner):
+    return _import('treeindex', 'make_tree_index')(edgelist_array)
+
+def _to_neighbor_file(edgelist_array, planner):
+    import tempfile
+    external = importlib.import_module('.external', __package__)
+    (fd, filename) = tempfile.mkstemp(suffix='.nbr')
+    os.close(fd)
+    try:
+        external.write_neighbor_file(edgelist_array, filename)
+        if planner.memory_budget is None:
+            nfile = external.NeighborFile(filename, planner.block_size)
+        else:
+            nfile = external.open_neighbor_file(filename,
+                                                planner.memory_budget,
+                                                planner.block_size)
+    except Exception:
+        os.remove(filename)
+        raise
+    nfile.filename = filename
+    return nfile
+
+def _close_neighbor_file(nfile):
+    nfile.close()
+    os.remove(nfile.filename)
+
+register_representation('list', lambda edgelist_array, planner:
+                            edgelist_array)
+register_representation('dict', _to_dict)
+register_representation('csr', _to_csr)
+register_representation('compressed', _to_compressed)
+register_representation('hub', _to_hub)
+register_representation('numpy', _to_numpy)
+register_representation('tree_index', _to_tree_index)
+register_representation('neighbor_file', _to_neighbor_file,
+                        _close_neighbor_file)
+
+# Capabilities an engine may declare:
+#   'numpy'          needs numpy installed
+#   'index'          searches a precomputed index, whose build cost is repaid
+#                    over many queries
+#   'vectorized'     expands whole levels at once, so wins when levels are big
+#   'hubs'           bounds the search by paths through high degree hubs
+#   'bounded_memory' keeps neighbor lists out of memory
+#   'any_node_numbers' also searches a dict keyed by meaningful node numbers
+
+class EngineInfo(object):
+    """ A registered engine: name; module and function, the search function,
+        imported on first use, called as function(root, target, graph) with
+        graph in the engine's representation and returning (path_len, path)
+        or None as bfs1,2 do; representation, the representation name; and
+        capabilities, a frozenset of the strings above.
+    """
+    def __init__(self, name, module, function, representation,
+                 capabilities=()):
+        self.name = name
+        self.module = module
+        self.function = function
+        self.representation = representation
+        self.capabilities = frozenset(capabilities)
+        self._search = None
+
+    def __repr__(self):
+        return 'EngineInfo({0!r}, {1!r}, {2!r}, {3!r}, {4!r})'.format(
+            self.name, self.module, self.function, self.representation,
+            sorted(self.capabilities))
+
+    @property
+    def search(self):
+        if self._search is None:
+            self._search = _import(self.module, self.function)
+        return self._search
+
+    # Returns True if the engine can run here, i.e. its optional dependencies
+    # are installed.
+
+    def available(self):
+        return 'numpy' not in self.capabilities or import_numpy() is not None
+
+engine_registry = dict()
+
+def register_engine(name, module, function, representation, capabilities=()):
+    if representation not in representations:
+        raise ValueError('unknown representation {0!r}'.format(
+                representation))
+    engine_registry[name] = EngineInfo(name, module, function, representation,
+                                       capabilities)
+    return engine_registry[name]
+
+def engine_info(name):
+    if name not in engine_registry:
+        raise ValueError('unknown engine {0!r}, expected one of {1}'.format(
+                name, ', '.join(sorted(engine_registry))))
+    return engine_registry[name]
+
+# bfs_csr_numpy takes the CSR arrays separately.
+
+def _bfs_csr_numpy(root, target, arrays):
+    return _import('batch', 'bfs_csr_numpy')(root, target, arrays[0],
+                                             arrays[1])
+
+register_engine('bfs1', 'bfs1', 'bfs1', 'dict', ['any_node_numbers'])
+register_engine('bfs2', 'bfs2', 'bfs2', 'list', ['any_node_numbers'])
+register_engine('bfs2_csr', 'bfs2', 'bfs2', 'csr')
+register_engine('bfs2_compressed', 'bfs2', 'bfs2', 'compressed')
+register_engine('bfs_hub', 'hubs', 'bfs_hub', 'hub', ['hubs'])
+register_engine('bfs_csr_numpy', 'planner', '_bfs_csr_numpy', 'numpy',
+                ['numpy', 'vectorized'])
+register_engine('bfs_tree_index', 'treeindex', 'bfs_tree_index', 'tree_index',
+                ['index'])
+register_engine('bfs_external', 'external', 'bfs_external', 'neighbor_file',
+                ['bounded_memory'])
+
+class GraphStats(object):
+    """ Statistics of an edgelist list with contiguous node numbers, from
+        graph_stats: nr_nodes; nr_edges, counting each undirected edge once;
+        avg_degree and max_degree; comp, an array giving each node's
+        component (numbered from 0 in order of lowest node) and
+        nr_components; cycle_rank, nr_edges - nr_nodes + nr_components, 0
+        for a forest; and diameter_estimate, a lower bound on the diameter
+        of the largest component from a double sweep bfs.
+    """
+    def __init__(self, nr_nodes, nr_edges, max_degree, comp, nr_components,
+                 diameter_estimate):
+        self.nr_nodes = nr_nodes
+        self.nr_edges = nr_edges
+        self.avg_degree = 2.0 * nr_edges / nr_nodes if nr_nodes else 0.0
+        self.max_degree = max_degree
+        self.comp = comp
+        self.nr_components = nr_components
+        self.cycle_rank = nr_edges - nr_nodes + nr_components
+        self.diameter_estimate = diameter_estimate
+
+    # Bytes the CSR arrays take, a lower bound on what any of the in memory
+    # representations takes.
+
+    def csr_bytes(self):
+        return 8 * (self.nr_nodes + 1) + 8 * self.nr_edges
+
+# Returns (depth dict, last node reached) of a bfs from root, marking the
+# nodes reached in comp with comp_nr if comp is given.
+
+def _bfs_depths(root, edgelist_array, comp=None, comp_nr=None):
+    depth = dict([(root, 0)])
+    if comp is not None:
+        comp[root] = comp_nr
+    queue = deque([root])
+    node = root
+    while queue:
+        node = queue.popleft()
+        for new_node in edgelist_array[node]:
+            if new_node not in depth:
+                depth[new_node] = depth[node] + 1
+                if comp is not None:
+                    comp[new_node] = comp_nr
+                queue.append(new_node)
+    return (depth, node)
+
+# Given an edgelist list with contiguous node numbers starting at 0, returns
+# its GraphStats, in time linear in its size: one bfs per component, plus one
+# more from the far end of the largest.
+
+def graph_stats(edgelist_array):
+    nr_nodes = len(edgelist_array)
+    nr_entries = 0
+    max_degree = 0
+    for el in edgelist_array:
+        nr_entries += len(el)
+        max_degree = max(max_degree, len(el))
+    comp = array('i', [-1]) * nr_nodes
+    nr_components = 0
+    (largest, far_node) = (0, None)
+    for root in range(0, nr_nodes):
+        if comp[root] < 0:
+            (depth, last) = _bfs_depths(root, edgelist_array, comp,
+                                        nr_components)
+            nr_components += 1
+            if len(depth) > largest:
+                (largest, far_node) = (len(depth), last)
+    diameter_estimate = 0
+    if far_node is not None:
+        (depth, last) = _bfs_depths(far_node, edgelist_array)
+        diameter_estimate = depth[last]
+    return GraphStats(nr_nodes, nr_entries // 2, max_degree, comp,
+                      nr_components, diameter_estimate)
+
+# Planner thresholds.  Every representation but the list, and the statistics
+# the plan is made from, cost a pass or several bfs over the whole graph, more
+# than a typical bfs2 search, which stops where its two sides meet.  So until
+# plan_min_queries queries are expected or have been run, the planner just
+# uses bfs2 on the list and computes no statistics; and the tree index, which
+# costs several times more to build, waits for index_min_queries.  (On an 88k
+# node tree a bfs2 search took 0.13 ms, the statistics 0.12 s and the index
+# 0.84 s, so each is repaid at about its threshold.)
+#
+# Once planned, a tree index is built when the graph has at most
+# index_max_cycle_rank independent cycles, since its core tables grow with
+# them.  Hubs are used when the highest degree is at least hub_degree_ratio
+# times the average on at least hub_min_nodes nodes.  The numpy engine is used
+# when a bfs level averages at least numpy_min_level_size nodes, estimated as
+# nr_nodes / (diameter_estimate + 1); on smaller levels its per level overhead
+# costs more than bfs2's python loop.
+
+plan_min_queries = 1000
+index_min_queries = 10000
+index_max_cycle_rank = 8
+hub_degree_ratio = 16.0
+hub_min_nodes = 1000
+numpy_min_level_size = 4096
+
+# Returns True if a graph with GraphStats stats has bfs levels wide enough for
+# the numpy engine, averaging numpy_min_level_size nodes or more.
+
+def wide_levels(stats):
+    return (stats.nr_nodes // (stats.diameter_estimate + 1)
+            >= numpy_min_level_size)
+
+class Planner(object):
+    """ Picks and runs engines for one graph, an edgelist list with
+        contiguous node numbers starting at 0, as from
+        gendata.make_contiguous_edgelist.  Converts the graph to each
+        representation it uses at most once and keeps the result (graph);
+        once it has statistics, answers queries between components without
+        searching; and falls back to the next engine in its plan if one can't
+        run here or its conversion fails.  Plans beyond bfs2 only once
+        expected_queries, or the count of searches run so far (nr_queries),
+        reaches the thresholds above.  With memory_budget (bytes) smaller
+        than the graph's CSR arrays, plans the semi-external engine first,
+        whose buffer pool of blocks of block_size bytes then takes what the
+        budget leaves.
+    """
+    def __init__(self, edgelist_array, memory_budget=None, stats=None,
+                 block_size=1 << 16, expected_queries=None):
+        self.edgelist_array = edgelist_array
+        self.memory_budget = memory_budget
+        self.block_size = block_size
+        self.expected_queries = expected_queries
+        self.nr_queries = 0
+        self._stats = stats
+        self.graphs = {'list': edgelist_array}
+        self.failed = dict()   # engine name: exception that stopped it
+        self._plan = None
+        self._plan_queries = None
+
+    # The GraphStats, computed on first use.
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            self._stats = graph_stats(self.edgelist_array)
+        return self._stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for (name, graph) in list(self.graphs.items()):
+            cleanup = representations[name][1]
+            if cleanup is not None:
+                cleanup(graph)
+        self.graphs = {'list': self.edgelist_array}
+
+    # Returns the graph in the named representation, converting it the first
+    # time.
+
+    def graph(self, representation):
+        if representation not in self.graphs:
+            converter = representations[representation][0]
+            self.graphs[representation] = converter(self.edgelist_array, self)
+        return self.graphs[representation]
+
+    # Returns the list of engine names to try, best first, from the graph
+    # statistics and the number of queries, leaving out engines that can't
+    # run here or have failed.  bfs2 and then bfs1 are always last, as they
+    # need no conversion.
+
+    def plan(self):
+        queries = max(self.nr_queries, self.expected_queries or 0)
+        queries = (index_min_queries if queries >= index_min_queries
+                   else plan_min_queries if queries >= plan_min_queries
+                   else 0)
+        if self._plan is None or self._plan_queries != queries:
+            plan = []
+            if (self.memory_budget is not None
+                and self.stats.csr_bytes() > self.memory_budget):
+                plan.append('bfs_external')
+            if queries:
+                stats = self.stats
+                if (queries >= index_min_queries
+                    and stats.cycle_rank <= index_max_cycle_rank):
+                    plan.append('bfs_tree_index')
+                if (stats.nr_nodes >= hub_min_nodes
+                    and stats.max_degree
+                    >= hub_degree_ratio * stats.avg_degree):
+                    plan.append('bfs_hub')
+                if wide_levels(stats):
+                    plan.append('bfs_csr_numpy')
+            plan.extend(['bfs2', 'bfs1'])
+            self._plan = [name for name in plan
+                          if engine_registry[name].available()]
+            self._plan_queries = queries
+        return [name for name in self._plan if name not in self.failed]
+
+    # Returns True if root and target are known to be in different
+    # components, which is known only once there are statistics.
+
+    def _apart(self, root, target):
+        return (self._stats is not None
+                and self._stats.comp[root] != self._stats.comp[target])
+
+    # Returns the name of the engine to use for root, target, or None if the
+    # answer needs no search: root == target, or they are in different
+    # components.
+
+    def plan_query(self, root, target):
+        if root == target:
+            return None
+        plan = self.plan()
+        return None if self._apart(root, target) else plan[0]
+
+    # Finds shortest path from root to target with the first engine in the
+    # plan whose representation can be made.  Returns (path_len, path), path
+    # given as list of nodes, or None if no path.
+
+    def search(self, root, target):
+        self.nr_queries += 1
+        if root == target:
+            return (0, [root])
+        plan = self.plan()
+        if self._apart(root, target):
+            return None
+        for name in plan:
+            info = engine_registry[name]
+            try:
+                graph = self.graph(info.representation)
+                search = info.search
+            except (ImportError, MemoryError, OSError, ValueError) as err:
+                self.failed[name] = err
+                continue
+            return search(root, target, graph)
+        raise RuntimeError('no engine could search the graph: {0}'.format(
+                self.failed))
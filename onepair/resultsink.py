@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# resultsink.py rev 19 Oct 2026
+# Streams (root, target, path_len, path) results to a compact binary file,
+# buffered in large blocks written by a background thread.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import struct
+import sys
+import queue
+import threading
+import zlib
+
+# File format, little-endian: a header of magic, version, and flags (bit 0 set
+# if compressed), then blocks, each a frame of (stored length, raw length)
+# uint64s followed by the stored bytes, zlib compressed if the flag is set.
+# The raw bytes of a block are whole records, each a (root, target, path_len)
+# int64 triple, path_len -1 for no path, followed by path_len + 1 int64 nodes.
+
+result_magic = b'OPRS'
+result_version = 1
+_header = struct.Struct('<4sBB')
+_frame = struct.Struct('<QQ')
+_record = struct.Struct('<qqq')
+_swap = sys.byteorder != 'little'
+
+class ResultWriter(object):
+    """ Writes search results to filename.  write() appends a record to the
+        current block; full blocks go through a bounded queue to a thread
+        that compresses (if compress) and writes them, so searching continues
+        while the file is written.  An error in the thread is raised by the
+        next write() or by close().
+    """
+    def __init__(self, filename, compress=False, block_size=1 << 22,
+                 queue_blocks=4):
+        self.compress = compress
+        self.block_size = block_size
+        self.block = bytearray()
+        self.nr_records = 0
+        self.error = None
+        self.outfile = open(filename, 'wb')
+        self.outfile.write(_header.pack(result_magic, result_version,
+                                        1 if compress else 0))
+        self.queue = queue.Queue(queue_blocks)
+        self.thread = threading.Thread(target=self._write_blocks)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_blocks(self):
+        while True:
+            block = self.queue.get()
+            if block is None:
+                return
+            if self.error is not None:
+                continue  # keep draining so the producer doesn't block
+            try:
+                stored = zlib.compress(block) if self.compress else block
+                self.outfile.write(_frame.pack(len(stored), len(block)))
+                self.outfile.write(stored)
+            except Exception:
+                self.error = sys.exc_info()[1]
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    # output as returned by bfs1,2: (path_len, path), or None if no path.
+
+    def write(self, root, target, output):
+        if output is None:
+            self.block += _record.pack(root, target, -1)
+        else:
+            self.block += _record.pack(root, target, output[0])
+            path = array('q', output[1])
+            if _swap:
+                path.byteswap()
+            self.block += path.tobytes()
+        self.nr_records += 1
+        if len(self.block) >= self.block_size:
+            self.flush()
+
+    # Hands the current block to the writer thread.
+
+    def flush(self):
+        self._check()
+        if self.block:
+            self.queue.put(bytes(self.block))
+            self.block = bytearray()
+
+    def close(self):
+        if self.outfile is None:
+            return
+        if self.block and self.error is None:
+            self.queue.put(bytes(self.block))
+        self.block = bytearray()
+        self.queue.put(None)
+        self.thread.join()
+        self.outfile.close()
+        self.outfile = None
+        self._check()
+
+# Yields (root, target, output) for each record in a file written by
+# ResultWriter, output as bfs1,2 return it.
+
+def read_results(filename):
+    infile = open(filename, 'rb')
+    try:
+        (magic, version, flags) = _header.unpack(infile.read(_header.size))
+        if magic != result_magic or version != result_version:
+            raise ValueError('{0} is not a version {1} result file'.format(
+                    filename, result_version))
+        while True:
+            frame = infile.read(_frame.size)
+            if not frame:
+                return
+            (stored_len, raw_len) = _frame.unpack(frame)
+            block = infile.read(stored_len)
+            if flags & 1:
+                block = zlib.decompress(block)
+            pos = 0
+            while pos < raw_len:
+                (root, target, path_len) = _record.unpack_from(block, pos)
+                pos += _record.size
+                if path_len < 0:
+                    yield (root, target, None)
+                else:
+                    end = pos + 8 * (path_len + 1)
+                    path = array('q')
+                    path.frombytes(block[pos:end])
+                    if _swap:
+                        path.byteswap()
+                    pos = end
+                    yield (root, target, (path_len, path.tolist()))
+    finally:
+        infile.close()
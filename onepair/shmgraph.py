@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# shmgraph.py rev 19 Oct 2026
+# Publishes a contiguous graph in one multiprocessing.shared_memory segment so
+# that worker processes can attach to it instead of each reading their own copy.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+import os
+
+from .csr import CSREdgelist, NodeNrToIx
+from .csr import make_csr_edgelist, make_nr_to_ix_arrays
+
+# Segment layout, all native byte order: a header of shm_header_len int64s
+# (magic, version, nr_nodes, nr_neighbors), then int64 arrays offsets
+# (nr_nodes + 1), node_ix_to_nr, sorted_nr, sorted_ix (nr_nodes each), then the
+# int32 array neighbors (nr_neighbors).  The int32 array comes last so that all
+# the int64 arrays stay 8-byte aligned.
+
+shm_magic = 0x6f6e6570616972   # 'onepair'
+shm_version = 1
+shm_header_len = 4
+
+# Names of the segments this process has published and not yet unlinked.
+
+_published = set()
+
+class SharedGraph(object):
+    """ A contiguous graph in a shared memory segment.
+        edgelist is a CSREdgelist usable by bfs2, node_ix_to_nr and
+        node_nr_to_ix replace the translations from make_contiguous_edgelist.
+        Pass name to attach_graph in another process.  Callers must drop any
+        neighbor slices they hold before close(), since a segment can't be
+        closed while memoryviews into it exist.
+    """
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.closed = False
+        buf = shm.buf
+        header = buf[0:8 * shm_header_len].cast('q')
+        (magic, version, nr_nodes, nr_neighbors) = header.tolist()
+        header.release()
+        if magic != shm_magic or version != shm_version:
+            raise ValueError('{0} is not a version {1} shared graph'.format(
+                    shm.name, shm_version))
+        start = 8 * shm_header_len
+        views = []
+        for (typecode, length) in (('q', nr_nodes + 1), ('q', nr_nodes),
+                                   ('q', nr_nodes), ('q', nr_nodes),
+                                   ('i', nr_neighbors)):
+            end = start + length * array(typecode).itemsize
+            views.append(buf[start:end].cast(typecode))
+            start = end
+        (offsets, self.node_ix_to_nr, sorted_nr, sorted_ix, neighbors) = views
+        self.edgelist = CSREdgelist(offsets, neighbors)
+        self.node_nr_to_ix = NodeNrToIx(sorted_nr, sorted_ix)
+        self._views = views
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def close(self):
+        if self.closed:
+            return
+        self.edgelist.release()
+        self.node_nr_to_ix.release()
+        for view in self._views:
+            view.release()
+        self._views = []
+        self.shm.close()
+        self.closed = True
+
+    # Only the publishing process should unlink, after workers are done.
+
+    def unlink(self):
+        self.shm.unlink()
+        _published.discard(self.name)
+
+# Copies the graph given by the edgelist list and node_ix_to_nr list from
+# make_contiguous_edgelist into a new shared memory segment, optionally with the
+# given name, and returns a SharedGraph owning it.
+
+def publish_graph(edgelist_array, node_ix_to_nr, name=None):
+    (offsets, neighbors) = make_csr_edgelist(edgelist_array)
+    ix_to_nr = array('q', node_ix_to_nr)
+    (sorted_nr, sorted_ix) = make_nr_to_ix_arrays(node_ix_to_nr)
+    header = array('q', [shm_magic, shm_version,
+                         len(edgelist_array), len(neighbors)])
+    parts = [header, offsets, ix_to_nr, sorted_nr, sorted_ix, neighbors]
+    size = sum([len(a) * a.itemsize for a in parts])
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        start = 0
+        for a in parts:
+            raw = memoryview(a).cast('B')
+            shm.buf[start:start + len(raw)] = raw
+            start += len(raw)
+            raw.release()
+        graph = SharedGraph(shm, True)
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    _published.add(graph.name)
+    return graph
+
+# Attaches to the shared memory segment with the given name, made by another
+# process or this one, and returns its SharedMemory.  An attaching process with
+# a resource tracker of its own takes the segment off the tracker's list, so
+# that its exit doesn't unlink a segment the maker still owns.  The publisher
+# itself, and multiprocessing children, which share their parent's tracker,
+# leave the list alone, as there that would take off the maker's own entry.
+
+def attach_segment(name):
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # track added in python 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        # Only posix segments are tracked.
+        if (os.name == 'posix' and name not in _published
+            and multiprocessing.parent_process() is None):
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+# Attaches to a segment made by publish_graph, without copying.  Raises
+# ValueError if the segment isn't a shared graph of this version.
+
+def attach_graph(name):
+    shm = attach_segment(name)
+    try:
+        return SharedGraph(shm, False)
+    except Exception:
+        shm.close()
+        raise
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# snapshot.py rev 19 Oct 2026
+# Saves a graph read from an edge file, with the state derived from it
+# (component labels, landmark distances, bfs trees from hot roots, node number
+# translation tables), as a versioned, checksummed set of files, and reopens
+# it memory mapped, so a restarted process can answer queries at once.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+from .bfs2      import bfs2
+from .csr       import CSREdgelist, NodeNrToIx, make_csr_edgelist, \
+                       make_nr_to_ix_arrays
+from .gendata   import make_contiguous_edgelist, read_edgelist
+from .planner   import GraphStats, Planner, graph_stats
+from .treeindex import bfs_tables
+
+# A snapshot with prefix p is the manifest p.manifest, JSON, and one file
+# p.<name>.arr per array, its raw bytes in native order.  The manifest holds
+# the format name and version, the byte order, the source edge file's size and
+# sha256, the graph statistics, the landmark and hot root node numbers
+# (contiguous), and for each array its typecode, length and sha256.  The
+# manifest is written last, and by rename, so a set without one is not a
+# snapshot.
+#
+# The arrays: offsets and neighbors, the CSR graph; ix_to_nr, sorted_nr and
+# sorted_ix, the node number translations (see csr.NodeNrToIx); comp, the
+# component of each node; landmark_dist, row i the bfs distances (-1 if
+# unreachable) from landmark i; and hot_parent, row i the bfs parents (-1 for
+# none) from hot root i.
+
+snapshot_format = 'onepair-snapshot'
+snapshot_version = 1
+
+def file_sha256(filename, block_size=1 << 20):
+    digest = hashlib.sha256()
+    infile = open(filename, 'rb')
+    block = infile.read(block_size)
+    while block:
+        digest.update(block)
+        block = infile.read(block_size)
+    infile.close()
+    return digest.hexdigest()
+
+def _array_filename(prefix, name):
+    return '{0}.{1}.arr'.format(prefix, name)
+
+# Reads edge_filename as gendata.read_edgelist does and saves its snapshot
+# under prefix, with landmarks the nr_landmarks highest degree nodes and bfs
+# trees from each node number in hot_roots.  Returns the list of filenames
+# written, manifest last.  Raises ValueError if a hot root isn't in the graph.
+
+def save_snapshot(edge_filename, prefix, hot_roots=(), nr_landmarks=4):
+    source_sha256 = file_sha256(edge_filename)
+    (el, el_arr, node_ix_to_nr, node_nr_to_ix) = make_contiguous_edgelist(
+        read_edgelist(edge_filename))
+    del el
+    nr_nodes = len(el_arr)
+    for nr in hot_roots:
+        if nr not in node_nr_to_ix:
+            raise ValueError('hot root {0} is not a node of {1}'.format(
+                    nr, edge_filename))
+    hot_ixs = [node_nr_to_ix[nr] for nr in hot_roots]
+    del node_nr_to_ix
+    stats = graph_stats(el_arr)
+    landmarks = sorted(range(0, nr_nodes),
+                       key=lambda ix: (-len(el_arr[ix]), ix))[:nr_landmarks]
+
+    (offsets, neighbors) = make_csr_edgelist(el_arr)
+    (sorted_nr, sorted_ix) = make_nr_to_ix_arrays(node_ix_to_nr)
+    landmark_dist = array('i')
+    for ix in landmarks:
+        landmark_dist.extend(bfs_tables(ix, el_arr)[0])
+    hot_parent = array('i')
+    for ix in hot_ixs:
+        hot_parent.extend(bfs_tables(ix, el_arr)[1])
+    arrays = [('offsets', offsets), ('neighbors', neighbors),
+              ('ix_to_nr', array('q', node_ix_to_nr)),
+              ('sorted_nr', sorted_nr), ('sorted_ix', sorted_ix),
+              ('comp', stats.comp), ('landmark_dist', landmark_dist),
+              ('hot_parent', hot_parent)]
+
+    filenames = []
+    manifest_arrays = dict()
+    for (name, arr) in arrays:
+        filename = _array_filename(prefix, name)
+        data = arr.tobytes()
+        outfile = open(filename, 'wb')
+        outfile.write(data)
+        outfile.close()
+        manifest_arrays[name] = {
+            'typecode': arr.typecode, 'length': len(arr),
+            'sha256': hashlib.sha256(data).hexdigest()}
+        filenames.append(filename)
+    manifest = {
+        'format': snapshot_format, 'version': snapshot_version,
+        'byteorder': sys.byteorder,
+        'source': {'size': os.path.getsize(edge_filename),
+                   'sha256': source_sha256},
+        'stats': {'nr_nodes': stats.nr_nodes, 'nr_edges': stats.nr_edges,
+                  'max_degree': stats.max_degree,
+                  'nr_components': stats.nr_components,
+                  'diameter_estimate': stats.diameter_estimate},
+        'landmarks': landmarks, 'hot_roots': hot_ixs,
+        'arrays': manifest_arrays}
+    manifest_filename = prefix + '.manifest'
+    outfile = open(manifest_filename + '.tmp', 'w')
+    json.dump(manifest, outfile, indent=1, sort_keys=True)
+    outfile.close()
+    os.replace(manifest_filename + '.tmp', manifest_filename)
+    filenames.append(manifest_filename)
+    return filenames
+
+class Snapshot(object):
+    """ A snapshot opened by open_snapshot, its arrays memoryviews over read
+        only memory maps: edgelist, a CSREdgelist usable by bfs2;
+        node_ix_to_nr and node_nr_to_ix (a csr.NodeNrToIx), the translations;
+        comp; landmarks, the landmark contiguous node numbers, with
+        landmark_dist(i) the distances from landmarks[i]; hot_roots, a dict
+        from each hot root's contiguous number to its bfs parent array; and
+        stats, the planner.GraphStats.
+    """
+    def __init__(self, manifest, maps, views):
+        self.manifest = manifest
+        self.maps = maps
+        self.views = views
+        self.nr_nodes = manifest['stats']['nr_nodes']
+        self.edgelist = CSREdgelist(views['offsets'], views['neighbors'])
+        self.node_ix_to_nr = views['ix_to_nr']
+        self.node_nr_to_ix = NodeNrToIx(views['sorted_nr'],
+                                        views['sorted_ix'])
+        self.comp = views['comp']
+        self.landmarks = manifest['landmarks']
+        self.hot_roots = dict(
+            (ix, views['hot_parent'][i * self.nr_nodes:
+                                     (i + 1) * self.nr_nodes])
+            for (i, ix) in enumerate(manifest['hot_roots']))
+        stats = manifest['stats']
+        self.stats = GraphStats(self.nr_nodes, stats['nr_edges'],
+                                stats['max_degree'], self.comp,
+                                stats['nr_components'],
+                                stats['diameter_estimate'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.edgelist.release()
+        self.node_nr_to_ix.release()
+        for view in self.hot_roots.values():
+            view.release()
+        for view in self.views.values():
+            view.release()
+        for data in self.maps:
+            data.close()
+        self.maps = []
+
+    def landmark_dist(self, i):
+        return self.views['landmark_dist'][i * self.nr_nodes:
+                                           (i + 1) * self.nr_nodes]
+
+    # Returns (lower, upper) bounds on the path length between contiguous
+    # nodes u and v from the landmark distances, by the triangle inequality,
+    # or None if they are in different components.  If no landmark is in
+    # their component, the bounds are just 0 (1 if u != v) and nr_nodes - 1.
+
+    def distance_bounds(self, u, v):
+        if self.comp[u] != self.comp[v]:
+            return None
+        if u == v:
+            return (0, 0)
+        dist = self.views['landmark_dist']
+        (lower, upper) = (1, self.nr_nodes - 1)
+        for i in range(0, len(self.landmarks)):
+            base = i * self.nr_nodes
+            (du, dv) = (dist[base + u], dist[base + v])
+            if du >= 0:
+                lower = max(lower, abs(du - dv))
+                upper = min(upper, du + dv)
+        return (lower, upper)
+
+    # Returns a planner.Planner over the mapped graph, using the saved
+    # statistics rather than recomputing them.
+
+    def planner(self, memory_budget=None, expected_queries=None):
+        return Planner(self.edgelist, memory_budget, self.stats,
+                       expected_queries=expected_queries)
+
+    # Finds shortest path from root to target, given and returned in the
+    # edge file's node numbers: through the saved bfs tree if either is a
+    # hot root, else by bfs2 over the mapped graph.  Returns (path_len, path)
+    # as bfs1 does, or None if no path.  Raises KeyError for an unknown node.
+
+    def search(self, root, target):
+        (u, v) = (self.node_nr_to_ix[root], self.node_nr_to_ix[target])
+        if self.comp[u] != self.comp[v]:
+            return None
+        if u in self.hot_roots or v in self.hot_roots:
+            (start, end) = (u, v) if u in self.hot_roots else (v, u)
+            parent = self.hot_roots[start]
+            path = [end]
+            while path[-1] != start:
+                path.append(parent[path[-1]])
+            if start == u:
+                path.reverse()
+            output = (len(path) - 1, path)
+        else:
+            output = bfs2(u, v, self.edgelist)
+        return (output[0], [self.node_ix_to_nr[ix] for ix in output[1]])
+
+# Returns (mmap, memoryview of it as typecode) for an array file, mmap None
+# if the array is empty.  Raises ValueError if the file size is wrong.
+
+def _map_array(filename, typecode, length):
+    size = length * array(typecode).itemsize
+    if os.path.getsize(filename) != size:
+        raise ValueError('{0} is not {1} bytes long'.format(filename, size))
+    if length == 0:
+        return (None, memoryview(array(typecode)))
+    infile = open(filename, 'rb')
+    data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    infile.close()
+    return (data, memoryview(data).cast(typecode))
+
+# Opens the snapshot saved under prefix.  If edge_filename is given, checks
+# that the snapshot was made from it as it is now; if verify, checks each
+# array against its checksum (reading all of it once).  Raises ValueError if
+# the manifest is not a snapshot of this version and byte order, or a check
+# fails.
+
+def open_snapshot(prefix, edge_filename=None, verify=True):
+    infile = open(prefix + '.manifest', 'r')
+    manifest = json.load(infile)
+    infile.close()
+    if (manifest.get('format') != snapshot_format
+        or manifest.get('version') != snapshot_version):
+        raise ValueError('{0}.manifest is not a version {1} snapshot'.format(
+                prefix, snapshot_version))
+    if manifest['byteorder'] != sys.byteorder:
+        raise ValueError('{0} was saved {1} endian'.format(
+                prefix, manifest['byteorder']))
+    if edge_filename is not None:
+        source = manifest['source']
+        if (os.path.getsize(edge_filename) != source['size']
+            or file_sha256(edge_filename) != source['sha256']):
+            raise ValueError('{0} was not made from {1} as it is now'.format(
+                    prefix, edge_filename))
+    maps = []
+    views = dict()
+    try:
+        for (name, info) in manifest['arrays'].items():
+            filename = _array_filename(prefix, name)
+            (data, view) = _map_array(filename, info['typecode'],
+                                      info['length'])
+            if data is not None:
+                maps.append(data)
+            views[name] = view
+            if (verify and
+                hashlib.sha256(view).hexdigest() != info['sha256']):
+                raise ValueError('{0} does not match its checksum'.format(
+                        filename))
+    except Exception:
+        for view in views.values():
+            view.release()
+        for data in maps:
+            data.close()
+        raise
+    return Snapshot(manifest, maps, views)
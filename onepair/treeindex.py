@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# treeindex.py rev 19 Oct 2026
+# Distance index for trees and near-trees: a bfs spanning forest with Euler
+# tour and sparse table lowest common ancestor, plus bfs tables from the
+# endpoints of the few edges not in the forest.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+from array import array
+from collections import deque
+
+# If a shortest path from u to v uses no edge outside the spanning forest, its
+# length is the tree distance, depth[u] + depth[v] - 2 * depth[lca(u, v)].
+# Otherwise let a be the first node on it that is an endpoint of a non-tree
+# edge: up to a the path is in the tree, and from a it is a shortest path, so
+# its length is tree distance(u, a) + dist(a, v).  So with bfs distances from
+# each such core node precomputed, the exact distance is a minimum over the
+# tree distance and one term per core node, each an O(1) lca.  The core tables
+# take nr_core * nr_nodes space, which is small only for near-trees.
+
+class TreeIndex(object):
+    """ Built by make_tree_index from an edgelist list with contiguous node
+        numbers.  parent, depth, and comp (the root of each node's tree) are
+        per node arrays of the bfs spanning forest; core lists the endpoints
+        of non-tree edges, with core_dist[i] and core_parent[i] the bfs
+        distances (-1 if unreachable) and parents from core[i].
+    """
+    def __init__(self, parent, depth, comp, euler, first, table, core,
+                 core_dist, core_parent):
+        self.parent = parent
+        self.depth = depth
+        self.comp = comp
+        self.euler = euler
+        self.first = first
+        self.table = table
+        self.core = core
+        self.core_dist = core_dist
+        self.core_parent = core_parent
+
+    def lca(self, u, v):
+        if self.comp[u] != self.comp[v]:
+            return None
+        (i, j) = (self.first[u], self.first[v])
+        if i > j:
+            (i, j) = (j, i)
+        k = (j - i + 1).bit_length() - 1
+        a = self.table[k][i]
+        b = self.table[k][j - (1 << k) + 1]
+        return a if self.depth[a] <= self.depth[b] else b
+
+    def tree_distance(self, u, v):
+        a = self.lca(u, v)
+        if a is None:
+            return None
+        return self.depth[u] + self.depth[v] - 2 * self.depth[a]
+
+    # Returns (length, core position) of the shortest path from u to v, core
+    # position None if the tree path is shortest, or None if no path.
+
+    def _best(self, u, v):
+        path_len = self.tree_distance(u, v)
+        best = None if path_len is None else (path_len, None)
+        for (i, a) in enumerate(self.core):
+            to_a = self.tree_distance(u, a)
+            from_a = self.core_dist[i][v]
+            if to_a is not None and from_a >= 0:
+                if best is None or to_a + from_a < best[0]:
+                    best = (to_a + from_a, i)
+        return best
+
+    def distance(self, u, v):
+        best = self._best(u, v)
+        return None if best is None else best[0]
+
+    def tree_path(self, u, v):
+        a = self.lca(u, v)
+        accum_u = [u]
+        while u != a:
+            u = self.parent[u]
+            accum_u.append(u)
+        accum_v = []
+        while v != a:
+            accum_v.append(v)
+            v = self.parent[v]
+        accum_v.reverse()
+        return accum_u + accum_v
+
+    # Returns (path_len, path), path given as list of nodes, the same form as
+    # bfs1,2 return, or None if no path.
+
+    def path(self, u, v):
+        best = self._best(u, v)
+        if best is None:
+            return None
+        (path_len, i) = best
+        if i is None:
+            return (path_len, self.tree_path(u, v))
+        accum = self.tree_path(u, self.core[i])
+        core_parent = self.core_parent[i]
+        accum_v = []
+        while v != self.core[i]:
+            accum_v.append(v)
+            v = core_parent[v]
+        accum_v.reverse()
+        return (path_len, accum + accum_v)
+
+# Returns bfs (dist, parent) arrays from root over the whole graph, an
+# edgelist list with contiguous node numbers, -1 for unreachable or no parent.
+
+def bfs_tables(root, edgelist_array):
+    nr_nodes = len(edgelist_array)
+    dist = array('i', [-1]) * nr_nodes
+    parent = array('i', [-1]) * nr_nodes
+    dist[root] = 0
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for new_node in edgelist_array[node]:
+            if dist[new_node] < 0:
+                dist[new_node] = dist[node] + 1
+                parent[new_node] = node
+                queue.append(new_node)
+    return (dist, parent)
+
+# Given an edgelist list with contiguous node numbers starting at 0, as from
+# gendata.make_contiguous_edgelist, returns a TreeIndex for it.
+
+def make_tree_index(edgelist_array):
+    nr_nodes = len(edgelist_array)
+    parent = array('i', [-1]) * nr_nodes
+    depth = array('i', [-1]) * nr_nodes
+    comp = array('i', [-1]) * nr_nodes
+    children = [[] for i in range(0, nr_nodes)]
+    core = set()
+
+    # Spanning forest, noting endpoints of edges not in it.
+    for root in range(0, nr_nodes):
+        if depth[root] >= 0:
+            continue
+        depth[root] = 0
+        comp[root] = root
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for new_node in edgelist_array[node]:
+                if depth[new_node] < 0:
+                    depth[new_node] = depth[node] + 1
+                    parent[new_node] = node
+                    comp[new_node] = root
+                    children[node].append(new_node)
+                    queue.append(new_node)
+                elif (new_node != parent[node] and node != parent[new_node]
+                      and new_node != node):
+                    core.add(node)
+                    core.add(new_node)
+
+    # Euler tour of each tree, and first position of each node in it.
+    euler = array('i')
+    first = array('i', [0]) * nr_nodes
+    for root in range(0, nr_nodes):
+        if parent[root] >= 0:
+            continue
+        first[root] = len(euler)
+        euler.append(root)
+        stack = [(root, 0)]
+        while stack:
+            (node, i) = stack[-1]
+            if i < len(children[node]):
+                stack[-1] = (node, i + 1)
+                child = children[node][i]
+                first[child] = len(euler)
+                euler.append(child)
+                stack.append((child, 0))
+            else:
+                stack.pop()
+                if stack:
+                    euler.append(stack[-1][0])
+
+    # Sparse table: table[k][i] is the least deep node in euler[i:i + 2**k].
+    table = [euler]
+    k = 1
+    while (1 << k) <= len(euler):
+        prev = table[-1]
+        half = 1 << (k - 1)
+        row = array('i', [0]) * (len(euler) - (1 << k) + 1)
+        for i in range(0, len(row)):
+            (a, b) = (prev[i], prev[i + half])
+            row[i] = a if depth[a] <= depth[b] else b
+        table.append(row)
+        k += 1
+
+    core = sorted(core)
+    core_dist = []
+    core_parent = []
+    for a in core:
+        (dist, core_par) = bfs_tables(a, edgelist_array)
+        core_dist.append(dist)
+        core_parent.append(core_par)
+    return TreeIndex(parent, depth, comp, euler, first, table, core,
+                     core_dist, core_parent)
+
+# Engine form of TreeIndex.path, taking the index where the other engines take
+# an edgelist.
+
+def bfs_tree_index(root, target, index):
+    return index.path(root, target)
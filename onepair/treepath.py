@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# treepath.py rev 19 Oct 2026
+# Shortest path between two nodes of a heap-numbered complete tree, from
+# gendata.construct_kary_tree_csr, by parent arithmetic rather than search.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+# In heap numbering a node's number is at least its parent's, so stepping the
+# larger of the two numbers up to its parent until they are equal walks both
+# nodes up to their lowest common ancestor in O(depth) steps.
+# Returns (path_len, path), path given as list of nodes, the same form as
+# bfs1,2 return.
+
+def tree_path(root, target, arity):
+    accum_r = []
+    accum_t = []
+    while root != target:
+        if root > target:
+            accum_r.append(root)
+            root = (root - 1) // arity
+        else:
+            accum_t.append(target)
+            target = (target - 1) // arity
+    accum_r.append(root)
+    accum_t.reverse()
+    accum = accum_r + accum_t
+    return (len(accum) - 1, accum)
+
+# Returns just the path length, without building the path.
+
+def tree_path_len(root, target, arity):
+    path_len = 0
+    while root != target:
+        if root > target:
+            root = (root - 1) // arity
+        else:
+            target = (target - 1) // arity
+        path_len += 1
+    return path_len
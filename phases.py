@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# phases.py rev 19 Oct 2026
+# Profiles the phases of answering queries on a graph read from an edge file
+# (parse, contiguous relabelling, index building, queries, and node number
+# translation) separately for time and tracemalloc peak memory, over sweeps of
+# node count and edge fraction, and fits scaling exponents to them.
+# Copyright (c) 2014 Stuart Ambler.
+# Distributed under the Boost License in the accompanying file LICENSE.
+
+import getopt
+import math
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+from onepair.gendata import (construct_random_graph, make_contiguous_edgelist,
+                             read_edgelist, write_edgelist_of_pairs)
+from onepair.planner import Planner, engine_info
+
+invalid_input_exit_code = 2
+
+phase_names = ['parse', 'relabel', 'index', 'query', 'translate']
+
+# Runs func(*args) twice, first timed, then traced by tracemalloc, so the
+# tracing doesn't slow the timed run; cleanup, if not None, is called with the
+# second run's result.  Returns (result of the first run, seconds, peak bytes
+# allocated during the second beyond those allocated before it).
+
+def measure(func, args, cleanup=None):
+    start = timeit.default_timer()
+    result = func(*args)
+    seconds = timeit.default_timer() - start
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    second = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    if not was_tracing:
+        tracemalloc.stop()
+    if cleanup is not None:
+        cleanup(second)
+    return (result, seconds, peak)
+
+def _translate_in(pairs, node_nr_to_ix):
+    return [(node_nr_to_ix[root], node_nr_to_ix[target])
+            for (root, target) in pairs]
+
+def _translate_out(outputs, node_ix_to_nr):
+    return [None if output is None
+            else (output[0], [node_ix_to_nr[node] for node in output[1]])
+            for output in outputs]
+
+def _make_index(el_arr, engine, nr_queries):
+    planner = Planner(el_arr, expected_queries=nr_queries)
+    planner.graph(engine_info(engine or planner.plan()[0]).representation)
+    return planner
+
+def _query(ix_pairs, planner, engine):
+    if engine is None:
+        return [planner.search(root, target) for (root, target) in ix_pairs]
+    info = engine_info(engine)
+    (search, graph) = (info.search, planner.graph(info.representation))
+    return [search(root, target, graph) for (root, target) in ix_pairs]
+
+# Generates a random graph as gendata.construct_random_graph does, writes it
+# to an edge file, and profiles reading it back and answering nr_queries
+# random queries with the named engine, or by default a planner.Planner told
+# to expect that many queries.
+# Returns (nr_nodes, nr_edges, phases), nr_edges counting both directions as
+# in the file, and phases a dict from each phase name to (seconds, peak
+# bytes); the translate phase is the sum of the times translating the pairs
+# to contiguous node numbers and the paths back, and the larger peak.
+
+def profile_graph(nr_nodes, fraction_edges, nr_queries=100, engine=None):
+    el = construct_random_graph(nr_nodes, fraction_edges)[0]
+    filename = write_edgelist_of_pairs((from_node, to_node)
+                                       for (from_node, el_n) in el.items()
+                                       for to_node in el_n)
+    nodes = sorted(el)
+    pairs = [(random.choice(nodes), random.choice(nodes))
+             for i in range(0, nr_queries)]
+    del el
+    phases = dict()
+
+    (el, t, peak) = measure(read_edgelist, (filename,))
+    os.remove(filename)
+    phases['parse'] = (t, peak)
+    ((el, el_arr, node_ix_to_nr, node_nr_to_ix), t, peak) = measure(
+        make_contiguous_edgelist, (el,))
+    phases['relabel'] = (t, peak)
+    (planner, t, peak) = measure(_make_index, (el_arr, engine, nr_queries),
+                                Planner.close)
+    phases['index'] = (t, peak)
+    (ix_pairs, t_in, peak_in) = measure(_translate_in,
+                                        (pairs, node_nr_to_ix))
+    (outputs, t, peak) = measure(_query, (ix_pairs, planner, engine))
+    phases['query'] = (t, peak)
+    (outputs, t_out, peak_out) = measure(_translate_out,
+                                         (outputs, node_ix_to_nr))
+    phases['translate'] = (t_in + t_out, max(peak_in, peak_out))
+    planner.close()
+    nr_edges = sum(len(el_n) for el_n in el_arr)
+    return (len(el_arr), nr_edges, phases)
+
+# Returns the least squares slope of log(ys) against log(xs), the exponent b
+# of the best fitting y = a * x**b, leaving out points with y <= 0; None if
+# fewer than two points are left or the xs are all equal.
+
+def fit_exponent(xs, ys):
+    points = [(math.log(x), math.log(y)) for (x, y) in zip(xs, ys) if y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(p[0] for p in points) / len(points)
+    mean_y = sum(p[1] for p in points) / len(points)
+    sxx = sum((p[0] - mean_x) ** 2 for p in points)
+    if sxx == 0:
+        return None
+    sxy = sum((p[0] - mean_x) * (p[1] - mean_y) for p in points)
+    return sxy / sxx
+
+# Profiles a graph for each node count in node_counts with fraction_edges, and
+# for each edge fraction in fractions with sweep_nr_nodes nodes.  Returns
+# (node_rows, fraction_rows, exponents): the rows, lists of (nr_nodes,
+# fraction, nr_edges, phases) in sweep order; and exponents, a dict from
+# (phase, 'seconds' or 'bytes') to (exponent in nr_nodes, exponent in
+# fraction), each None if it can't be fitted.
+
+def sweep(node_counts, fraction_edges, fractions, sweep_nr_nodes,
+          nr_queries=100, engine=None):
+    node_rows = []
+    for nr_nodes in node_counts:
+        (act_nr_nodes, nr_edges, phases) = profile_graph(
+            nr_nodes, fraction_edges, nr_queries, engine)
+        node_rows.append((act_nr_nodes, fraction_edges, nr_edges, phases))
+    fraction_rows = []
+    for fraction in fractions:
+        (act_nr_nodes, nr_edges, phases) = profile_graph(
+            sweep_nr_nodes, fraction, nr_queries, engine)
+        fraction_rows.append((act_nr_nodes, fraction, nr_edges, phases))
+    exponents = dict()
+    for phase in phase_names:
+        for (k, unit) in enumerate(['seconds', 'bytes']):
+            exponents[(phase, unit)] = (
+                fit_exponent([row[0] for row in node_rows],
+                             [row[3][phase][k] for row in node_rows]),
+                fit_exponent([row[1] for row in fraction_rows],
+                             [row[3][phase][k] for row in fraction_rows]))
+    return (node_rows, fraction_rows, exponents)
+
+def print_rows(title, rows):
+    print(title)
+    print('  {0:>8} {1:>8} {2:>9}'.format('nodes', 'fraction', 'edges')
+          + ''.join(' {0:>20}'.format(phase + ' s/KiB')
+                    for phase in phase_names))
+    for (nr_nodes, fraction, nr_edges, phases) in rows:
+        print('  {0:>8} {1:>8} {2:>9}'.format(nr_nodes, fraction, nr_edges)
+              + ''.join(' {0:>11.4f}/{1:<8}'.format(
+                        phases[phase][0], phases[phase][1] // 1024)
+                        for phase in phase_names))
+
+def print_exponents(exponents):
+    def fmt(exponent):
+        return '{0:>10}'.format('-' if exponent is None
+                                else '{0:.2f}'.format(exponent))
+    print('scaling exponents')
+    print('  {0:<10} {1:>10} {2:>10} {3:>10} {4:>10}'.format(
+            'phase', 'time/n', 'time/frac', 'mem/n', 'mem/frac'))
+    for phase in phase_names:
+        print('  {0:<10}'.format(phase)
+              + ''.join(' ' + fmt(e) for e in exponents[(phase, 'seconds')]
+                        + exponents[(phase, 'bytes')]))
+
+def usage():
+    print(
+        """
+Usage: python phases.py [-n <node_counts>] [-f <fraction_edges>]
+                        [-F <fractions>] [-N <nr_nodes>] [-q <nr_queries>]
+                        [-e <engine>] [-s <seed>] [-h]
+  defaults: python phases.py -n 500,1000,2000,4000 -f 0.002
+                             -F 0.001,0.002,0.004,0.008 -N 2000 -q 100
+  -n, -f: node count sweep, at the given edge fraction;
+  -F, -N: edge fraction sweep, at the given node count;
+  -e: engine name from the planner registry, default the planner's choice.
+""")
+
+def main(argv):
+    node_counts = [500, 1000, 2000, 4000]
+    fraction_edges = 0.002
+    fractions = [0.001, 0.002, 0.004, 0.008]
+    sweep_nr_nodes = 2000
+    nr_queries = 100
+    engine = None
+    if isinstance(argv, str):
+        argv = argv.split()
+    try:
+        (opts, args) = getopt.getopt(argv, 'n:f:F:N:q:e:s:h')
+        for (opt, arg) in opts:
+            if opt == '-n':
+                node_counts = [int(x) for x in arg.split(',')]
+            elif opt == '-f':
+                fraction_edges = float(arg)
+            elif opt == '-F':
+                fractions = [float(x) for x in arg.split(',')]
+            elif opt == '-N':
+                sweep_nr_nodes = int(arg)
+            elif opt == '-q':
+                nr_queries = int(arg)
+            elif opt == '-e':
+                engine_info(arg)
+                engine = arg
+            elif opt == '-s':
+                random.seed(int(arg))
+            elif opt == '-h':
+                usage()
+                sys.exit(0)
+    except (getopt.GetoptError, ValueError) as err:
+        print(str(err))
+        usage()
+        sys.exit(invalid_input_exit_code)
+
+    (node_rows, fraction_rows, exponents) = sweep(
+        node_counts, fraction_edges, fractions, sweep_nr_nodes, nr_queries,
+        engine)
+    print_rows('node count sweep', node_rows)
+    print_rows('edge fraction sweep', fraction_rows)
+    print_exponents(exponents)
+    return exponents
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
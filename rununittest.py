@@ -19,8 +19,8 @@ class TestTest(unittest.TestCase):
     def test_overall(self):
         """ Test via test frameworks.
         """
-        import bfs1
-        import bfs2
+        from onepair import bfs1
+        from onepair import bfs2
         import bfserr
         import test
         self.assertEqual([], test.main(''))
@@ -80,6 +80,551 @@ class TestTest(unittest.TestCase):
 
         self.assertNotEqual([], test.test_example([], [], [], False, True))
 
+    def test_shared_graph(self):
+        """ Test publishing and attaching to a shared memory graph.
+        """
+        import multiprocessing
+        from onepair import bfs2
+        from onepair import gendata
+        from onepair import shmgraph
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.make_contiguous_edgelist(gendata.read_edgelist(
+                'edgelist.txt'))
+        with shmgraph.publish_graph(el_arr, el_nd_ix_2_nr) as published:
+            shared = shmgraph.attach_graph(published.name)
+            self.assertEqual(list(el_nd_ix_2_nr), shared.node_ix_to_nr.tolist())
+            for nr in el.keys():
+                self.assertEqual(el_nd_nr_2_ix[nr], shared.node_nr_to_ix[nr])
+            self.assertNotIn(10, shared.node_nr_to_ix)
+            for ix in range(0, len(el_arr)):
+                self.assertEqual(el_arr[ix], shared.edgelist[ix].tolist())
+            for root in range(0, len(el_arr)):
+                for target in range(0, len(el_arr)):
+                    self.assertEqual(bfs2.bfs2(root, target, el_arr),
+                                     bfs2.bfs2(root, target, shared.edgelist))
+            shared.close()
+            pool = multiprocessing.Pool(2)
+            self.assertEqual([(4, [7, 6, 1, 2, 3])] * 2,
+                             pool.map(shared_graph_worker,
+                                      [(published.name, 7, 3)] * 2))
+            pool.close()
+            pool.join()
+            published.shm.buf[0:8] = bytes(8)  # spoil the magic
+            self.assertRaises(ValueError, shmgraph.attach_graph,
+                              published.name)
+
+    def test_batch(self):
+        """ Test threaded batch search against bfs1, with and without numpy.
+        """
+        import itertools
+        from onepair import batch
+        from onepair import bfs1
+        from onepair import bfs2
+        from onepair import gendata
+        from onepair import optional
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(200, 0.01)
+        pairs = list(itertools.product(range(0, len(el_arr)), repeat=2))[::7]
+        expected = [bfs1.bfs1(el_nd_ix_2_nr[r], el_nd_ix_2_nr[t], el)
+                    for (r, t) in pairs]
+        # Levels of a few nodes are too narrow for the numpy engine, so by
+        # default the batch, long enough to plan for, uses bfs2.
+        self.assertEqual([bfs2.bfs2(r, t, el_arr) for (r, t) in pairs],
+                         batch.bfs_batch(pairs, el_arr, 2))
+        for use_numpy in [False] + ([True] if optional.import_numpy() else []):
+            outputs = batch.bfs_batch(pairs, el_arr, 4, use_numpy)
+            for (expect, output) in zip(expected, outputs):
+                if expect is None:
+                    self.assertIsNone(output)
+                else:
+                    self.assertEqual(expect[0], output[0])
+
+    def test_compressed(self):
+        """ Test the varint compressed edgelist decodes and searches correctly.
+        """
+        from onepair import bfs2
+        from onepair import compress
+        from onepair import gendata
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(300, 0.01)
+        el_arr.append([0, 0, 2**40, 5])
+        el_comp = compress.make_compressed_edgelist(el_arr)
+        self.assertEqual(len(el_arr), len(el_comp))
+        for ix in range(0, len(el_arr)):
+            self.assertEqual(sorted(el_arr[ix]), el_comp[ix])
+        el_arr.pop()
+        el_comp = compress.make_compressed_edgelist(el_arr)
+        for root in range(0, len(el_arr), 3):
+            for target in range(1, len(el_arr), 5):
+                expected = bfs2.bfs2(root, target, el_arr)
+                output = bfs2.bfs2(root, target, el_comp)
+                self.assertEqual(expected is None, output is None)
+                if expected is not None:
+                    self.assertEqual(expected[0], output[0])
+
+    def test_hubs(self):
+        """ Test the hub bounded search against bfs1 on a graph with hubs.
+        """
+        import random
+        from onepair import bfs1
+        from onepair import gendata
+        from onepair import hubs
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(300, 0.003)
+        nr_nodes = len(el_arr)
+        for hub in range(0, 4):
+            for node in random.sample(range(4, nr_nodes), nr_nodes // 4):
+                if node not in el_arr[hub]:
+                    el_arr[hub].append(node)
+                    el_arr[node].append(hub)
+        el = dict(enumerate(el_arr))
+        hub_el = hubs.make_hub_edgelist(el_arr, 6)
+        self.assertEqual([0, 1, 2, 3], sorted(hub_el.hubs[:4]))
+        for ix in range(0, nr_nodes):
+            self.assertEqual(sorted(el_arr[ix]), sorted(hub_el[ix]))
+        for root in range(0, nr_nodes, 3):
+            for target in range(1, nr_nodes, 7):
+                expected = bfs1.bfs1(root, target, el)
+                output = hubs.bfs_hub(root, target, hub_el)
+                self.assertEqual(expected is None, output is None)
+                if expected is not None:
+                    self.assertEqual(expected[0], output[0])
+                    self.assertEqual(set([root, target]),
+                                     set([output[1][0], output[1][-1]]))
+                    for (a, b) in zip(output[1], output[1][1:]):
+                        self.assertIn(b, el_arr[a])
+
+    def test_all_pairs(self):
+        """ Test the all pairs distance matrix against bfs2, in memory and
+            memory mapped.
+        """
+        import os
+        import tempfile
+        from onepair import allpairs
+        from onepair import bfs2
+        from onepair import gendata
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(150, 0.005)
+        nr_nodes = len(el_arr)
+        matrix = allpairs.all_pairs_distances(el_arr, block_size=16)
+        for root in range(0, nr_nodes):
+            for target in range(0, nr_nodes):
+                expected = bfs2.bfs2(root, target, el_arr)
+                self.assertEqual(None if expected is None else expected[0],
+                                 matrix[root, target])
+        (fd, filename) = tempfile.mkstemp()
+        os.close(fd)
+        allpairs.all_pairs_distances(el_arr, filename).close()
+        mapped = allpairs.open_distance_matrix(filename, nr_nodes)
+        self.assertEqual(bytes(matrix.data), mapped.data[:])
+        mapped.close()
+        os.remove(filename)
+        # Paths of 254, the longest below the unreachable marker, fit; 255
+        # don't.
+        for nr_nodes in (255, 256):
+            path_arr = [[node + d for d in (-1, 1) if 0 <= node + d < nr_nodes]
+                        for node in range(0, nr_nodes)]
+            if nr_nodes == 255:
+                matrix = allpairs.all_pairs_distances(path_arr)
+                self.assertEqual(254, matrix[0, 254])
+                self.assertEqual(254, matrix[254, 0])
+                self.assertEqual(1, matrix[100, 101])
+            else:
+                self.assertRaises(ValueError, allpairs.all_pairs_distances,
+                                  path_arr)
+
+    def test_tree_path(self):
+        """ Test the heap numbered tree generator and tree_path against bfs2.
+        """
+        from onepair import bfs2
+        from onepair import csr
+        from onepair import gendata
+        from onepair import treepath
+        for arity in (1, 2, 5):
+            for max_depth in (0, 1, 4):
+                tree = csr.CSREdgelist(*gendata.construct_kary_tree_csr(
+                        arity, max_depth))
+                nr_nodes = gendata.kary_tree_nr_nodes(arity, max_depth)
+                self.assertEqual(nr_nodes, len(tree))
+                self.assertEqual(2 * (nr_nodes - 1), len(tree.neighbors))
+                for root in range(0, nr_nodes, 3):
+                    for target in range(0, nr_nodes, 2):
+                        output = treepath.tree_path(root, target, arity)
+                        self.assertEqual(bfs2.bfs2(root, target, tree)[0],
+                                         output[0])
+                        self.assertEqual(output[0], treepath.tree_path_len(
+                                root, target, arity))
+                        self.assertEqual([root, target],
+                                         [output[1][0], output[1][-1]])
+                        for (a, b) in zip(output[1], output[1][1:]):
+                            self.assertIn(b, tree[a].tolist())
+
+    def test_tree_index(self):
+        """ Test the lca index against bfs2 on a forest with extra edges.
+        """
+        import random
+        from onepair import bfs2
+        from onepair import treeindex
+        nr_nodes = 200
+        el_arr = [[] for i in range(0, nr_nodes)]
+        for node in range(1, nr_nodes):
+            if node % 50:
+                other = random.randrange(node)
+                el_arr[node].append(other)
+                el_arr[other].append(node)
+        for i in range(0, 4):
+            (a, b) = random.sample(range(0, nr_nodes), 2)
+            el_arr[a].append(b)
+            el_arr[b].append(a)
+        index = treeindex.make_tree_index(el_arr)
+        self.assertTrue(len(index.core) <= 8)
+        for root in range(0, nr_nodes, 3):
+            for target in range(0, nr_nodes, 7):
+                expected = bfs2.bfs2(root, target, el_arr)
+                output = index.path(root, target)
+                self.assertEqual(expected is None, output is None)
+                if expected is not None:
+                    self.assertEqual(expected[0], output[0])
+                    self.assertEqual(output[0], index.distance(root, target))
+                    self.assertEqual([root, target],
+                                     [output[1][0], output[1][-1]])
+                    for (a, b) in zip(output[1], output[1][1:]):
+                        self.assertIn(b, el_arr[a])
+
+    def test_phases(self):
+        """ Test the phase profiler's exponent fit and a small sweep.
+        """
+        import phases
+        self.assertAlmostEqual(2.0, phases.fit_exponent([1, 2, 4],
+                                                        [3, 12, 48]))
+        self.assertIsNone(phases.fit_exponent([5, 5], [1, 2]))
+        self.assertIsNone(phases.fit_exponent([1, 2], [1, 0]))
+        (node_rows, fraction_rows, exponents) = phases.sweep(
+            [100, 200], 0.02, [0.01, 0.02], 150, 10)
+        self.assertEqual(2, len(node_rows))
+        self.assertEqual(2, len(fraction_rows))
+        for row in node_rows + fraction_rows:
+            self.assertEqual(set(phases.phase_names), set(row[3]))
+            self.assertTrue(row[3]['parse'][1] > 0)
+        self.assertEqual(2 * len(phases.phase_names), len(exponents))
+        self.assertIsNotNone(exponents[('parse', 'bytes')][0])
+
+    def test_planner(self):
+        """ Test the planner's engine choice, conversion reuse, component
+            shortcut and fallback.
+        """
+        import onepair
+        from onepair import bfs2
+        from onepair import gendata
+        from onepair import planner
+        tree = gendata.construct_tree_edgelist(3, 5)[1]
+        with planner.Planner(tree) as tree_planner:
+            # Too few queries to repay any conversion, or the statistics.
+            self.assertEqual(['bfs2', 'bfs1'], tree_planner.plan())
+            self.assertEqual(bfs2.bfs2(5, 90, tree)[0],
+                             tree_planner.search(5, 90)[0])
+            self.assertIsNone(tree_planner._stats)
+            for i in range(1, planner.index_min_queries - 1):
+                tree_planner.search(i % len(tree), 90)
+            self.assertIsNotNone(tree_planner._stats)
+            self.assertEqual(['list'], list(tree_planner.graphs))
+            tree_planner.search(5, 90)
+            self.assertIn('tree_index', tree_planner.graphs)
+        with planner.Planner(
+            tree, expected_queries=planner.index_min_queries) as tree_planner:
+            self.assertEqual(0, tree_planner.stats.cycle_rank)
+            self.assertEqual(10, tree_planner.stats.diameter_estimate)
+            self.assertEqual('bfs_tree_index', tree_planner.plan()[0])
+            self.assertEqual(bfs2.bfs2(5, 90, tree)[0],
+                             tree_planner.search(5, 90)[0])
+            index = tree_planner.graphs['tree_index']
+            tree_planner.search(7, 80)
+            self.assertIs(index, tree_planner.graph('tree_index'))
+        el_arr = gendata.construct_random_graph(300, 0.01)[1]
+        el_arr.append([])
+        with planner.Planner(el_arr, memory_budget=100) as ran_planner:
+            self.assertEqual('bfs_external', ran_planner.plan()[0])
+            self.assertIsNone(ran_planner.plan_query(0, len(el_arr) - 1))
+            self.assertIsNone(ran_planner.search(0, len(el_arr) - 1))
+            self.assertEqual(['list'], list(ran_planner.graphs))
+            for target in range(1, 20):
+                expected = bfs2.bfs2(0, target, el_arr)
+                output = ran_planner.search(0, target)
+                self.assertEqual(expected is None, output is None)
+                if expected is not None:
+                    self.assertEqual(expected[0], output[0])
+            self.assertIn('bfs_external', ran_planner.failed)
+            self.assertNotIn('bfs_external', ran_planner.plan())
+        self.assertIs(bfs2.bfs2, onepair.get_engine('bfs2'))
+        self.assertRaises(ValueError, onepair.get_engine, 'bfs3')
+
+    def test_parallel_build(self):
+        """ Test the parallel CSR build gives the graph read_edgelist does.
+        """
+        from onepair import parbuild
+        from onepair import gendata
+        el = gendata.read_edgelist('edgelist.txt')
+        for (nr_workers, nr_chunks) in ((1, 1), (2, 5), (3, 100)):
+            (edgelist, node_ix_to_nr, node_nr_to_ix) = \
+                parbuild.read_csr_edgelist_parallel('edgelist.txt', nr_workers,
+                                                    nr_chunks)
+            self.assertEqual(sorted(el.keys()), node_ix_to_nr.tolist())
+            for (nr, nr_list) in el.items():
+                self.assertEqual(nr_list, [node_ix_to_nr[ix] for ix in
+                                           edgelist[node_nr_to_ix[nr]]])
+
+    def test_undirected_loader(self):
+        """ Test reading one line per undirected edge, and symmetry checking.
+        """
+        import os
+        from onepair import gendata
+        correct = gendata.correctly_read_example_edgelist_of_pairs()
+        self.assertEqual(correct, gendata.read_edgelist('edgelist.txt', True))
+        tmp_filename = gendata.write_edgelist_of_pairs(
+            gendata.example_undirected_edgelist_of_pairs() + [(2, 1), (3, 2)])
+        self.assertEqual(correct,
+                         gendata.read_undirected_edgelist(tmp_filename))
+        upper = gendata.read_undirected_edgelist(tmp_filename, True)
+        self.assertEqual([3], upper.upper(2))
+        self.assertEqual([2, 4, 5], upper[3])
+        for node in correct:
+            self.assertEqual(correct[node], upper[node])
+        self.assertEqual(correct, upper.full())
+        self.assertEqual(correct, dict(upper.items()))
+        self.assertEqual([6], upper.get(7))
+        self.assertIsNone(upper.get(10))
+        contig = gendata.make_contiguous_edgelist(upper)
+        self.assertEqual([], gendata.asymmetric_pairs(
+                dict(enumerate(contig[1]))))
+        # The loader without numpy.
+        ends = [node for pair in gendata.example_undirected_edgelist_of_pairs()
+                + [(2, 1), (3, 2)] for node in pair]
+        self.assertEqual(correct, gendata._undirected_edgelist(ends))
+        upper = gendata._split_edgelist(gendata._undirected_edgelist(ends))
+        self.assertEqual([3], upper.upper(2))
+        self.assertEqual(correct, upper.full())
+        self.assertRaises(ValueError, gendata.read_edgelist, tmp_filename, True)
+        self.assertEqual(6, len(gendata.asymmetric_pairs(
+                    gendata.read_edgelist(tmp_filename))))
+        os.remove(tmp_filename)
+
+    def test_result_sink(self):
+        """ Test writing and reading back results, plain and compressed,
+            from batch searches and from test.py -o.
+        """
+        import itertools
+        import os
+        import tempfile
+        from onepair import batch
+        from onepair import gendata
+        from onepair import resultsink
+        import test
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(100, 0.01)
+        pairs = list(itertools.product(range(0, len(el_arr)), repeat=2))
+        expected = batch.bfs_batch(pairs, el_arr, 1, False)
+        (fd, filename) = tempfile.mkstemp()
+        os.close(fd)
+        for compress in (False, True):
+            with resultsink.ResultWriter(filename, compress, 4096) as sink:
+                self.assertIsNone(batch.bfs_batch(pairs, el_arr, 2, False,
+                                                  sink))
+            self.assertEqual([(r, t, output) for ((r, t), output)
+                              in zip(pairs, expected)],
+                             list(resultsink.read_results(filename)))
+            for nr_threads in (1, 2):
+                with resultsink.ResultWriter(filename, compress,
+                                             4096) as sink:
+                    batch.bfs_batch((pair for pair in pairs), el_arr,
+                                    nr_threads, False, sink)
+                self.assertEqual([(r, t, output) for ((r, t), output)
+                                  in zip(pairs, expected)],
+                                 list(resultsink.read_results(filename)))
+        self.assertEqual([], test.main('-e edgelist.txt -o ' + filename))
+        results = list(resultsink.read_results(filename))
+        self.assertEqual(36, len(results))
+        self.assertEqual((1, 7, (2, [7, 6, 1])), results[5])
+        os.remove(filename)
+
+    def test_external(self):
+        """ Test the semi-external search gives the same results as bfs2.
+        """
+        import os
+        import tempfile
+        from onepair import bfs2
+        from onepair import external
+        from onepair import gendata
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(400, 0.005)
+        (fd, filename) = tempfile.mkstemp()
+        os.close(fd)
+        external.write_neighbor_file(el_arr, filename)
+        with external.NeighborFile(filename, 256, 4) as nfile:
+            self.assertEqual(len(el_arr), len(nfile))
+            for ix in range(0, len(el_arr)):
+                self.assertEqual(el_arr[ix], nfile[ix].tolist())
+            for root in range(0, len(el_arr), 7):
+                for target in range(0, len(el_arr), 11):
+                    self.assertEqual(bfs2.bfs2(root, target, el_arr),
+                                     external.bfs_external(root, target,
+                                                           nfile))
+            self.assertTrue(len(nfile.buffers) <= 4)
+        self.assertRaises(ValueError, external.open_neighbor_file, filename,
+                          1000)
+        for block_size in [0, 3]:
+            self.assertRaises(ValueError, external.NeighborFile, filename,
+                              block_size)
+            self.assertRaises(ValueError, external.open_neighbor_file,
+                              filename, 100000, block_size)
+        with external.NeighborFile(filename, 7, 4) as nfile:
+            self.assertEqual(4, nfile.block_size)
+            self.assertEqual(bfs2.bfs2(0, 1, el_arr),
+                             external.bfs_external(0, 1, nfile))
+        nfile = external.open_neighbor_file(filename, 100000, 1024)
+        self.assertEqual((100000 - 24 * (len(el_arr) + 1)) // 1024,
+                         nfile.nr_buffers)
+        nfile.close()
+        os.remove(filename)
+
+    def test_partition(self):
+        """ Test sharding, and the sharded search's path lengths against bfs2.
+        """
+        import os
+        import shutil
+        import tempfile
+        from onepair import bfs2
+        from onepair import gendata
+        from onepair import partition
+        (el, el_arr, el_nd_ix_2_nr, el_nd_nr_2_ix) = \
+            gendata.construct_random_graph(300, 0.005)
+        nr_nodes = len(el_arr)
+        tmp_dir = tempfile.mkdtemp()
+        prefix = os.path.join(tmp_dir, 'graph')
+        filenames = partition.save_shards(el_arr, 3, prefix)
+        shards = [partition.load_shard(filename) for filename in filenames]
+        self.assertEqual(list(range(0, nr_nodes)),
+                         sorted(sum([shard.nodes.tolist()
+                                     for shard in shards], [])))
+        for shard in shards:
+            self.assertTrue(abs(len(shard.nodes) - nr_nodes / 3.0) < 1)
+            for node in shard.nodes:
+                self.assertEqual(el_arr[node], shard[node].tolist())
+            for node in shard.boundary:
+                self.assertTrue([n for n in el_arr[node]
+                                 if n in shard.remote_owner])
+        with partition.ShardedSearch(prefix, 3) as search:
+            for root in range(0, nr_nodes, 13):
+                for target in range(0, nr_nodes, 17):
+                    expected = bfs2.bfs2(root, target, el_arr)
+                    output = search.bfs(root, target)
+                    self.assertEqual(expected is None, output is None)
+                    if expected is None:
+                        continue
+                    self.assertEqual(expected[0], output[0])
+                    self.assertEqual(sorted([root, target]),
+                                     sorted([output[1][0], output[1][-1]]))
+                    for (a, b) in zip(output[1], output[1][1:]):
+                        self.assertIn(b, el_arr[a])
+        shutil.rmtree(tmp_dir)
+
+    def test_snapshot(self):
+        """ Test saving and reopening a snapshot, and its staleness and
+            checksum checks.
+        """
+        import os
+        import random
+        from onepair import bfs1
+        from onepair import gendata
+        from onepair import snapshot
+        random.seed(42)
+        el = gendata.construct_random_graph(300, 0.006)[0]
+        edge_filename = gendata.write_edgelist_of_pairs(
+            (node, new_node) for node in el for new_node in el[node])
+        prefix = edge_filename + '.snap'
+        nodes = sorted(el)
+        hot_roots = nodes[:2]
+        filenames = snapshot.save_snapshot(edge_filename, prefix, hot_roots)
+        try:
+            with snapshot.open_snapshot(prefix, edge_filename) as snap:
+                self.assertEqual(len(nodes), snap.nr_nodes)
+                self.assertEqual(4, len(snap.landmarks))
+                for root in nodes[2:5] + hot_roots:
+                    for target in nodes[::9]:
+                        expected = bfs1.bfs1(root, target, el)
+                        output = snap.search(root, target)
+                        self.assertEqual(expected is None, output is None)
+                        if expected is None:
+                            continue
+                        self.assertEqual(expected[0], output[0])
+                        self.assertEqual(sorted([root, target]),
+                                         sorted([output[1][0], output[1][-1]]))
+                        (lower, upper) = snap.distance_bounds(
+                            snap.node_nr_to_ix[root],
+                            snap.node_nr_to_ix[target])
+                        self.assertTrue(lower <= expected[0] <= upper)
+            outfile = open(filenames[0], 'r+b')
+            outfile.write(b'\xff')
+            outfile.close()
+            self.assertRaises(ValueError, snapshot.open_snapshot, prefix)
+            snapshot.open_snapshot(prefix, verify=False).close()
+            outfile = open(edge_filename, 'a')
+            outfile.write('{0} {0}\n'.format(nodes[0]))
+            outfile.close()
+            self.assertRaises(ValueError, snapshot.open_snapshot, prefix,
+                              edge_filename, False)
+        finally:
+            for filename in filenames + [edge_filename]:
+                os.remove(filename)
+
+    def test_fuzz(self):
+        """ Test that the fuzzer passes the engines, catches a bad engine, and
+            flags slowdowns against a baseline.
+        """
+        import random
+        import bfserr
+        import fuzz
+        from onepair import optional
+        (problems, timings) = fuzz.fuzz(1, 14, 10)
+        self.assertEqual([], problems)
+        for name in ['bfs_hub', 'planner_unbudgeted', 'bfs_batch', 'sharded',
+                     'all_pairs', 'upper_triangle']:
+            self.assertIn(name, timings)
+        rng = random.Random(1)
+        planned = set()
+        for shape in 2 * fuzz.graph_shapes:
+            planner = fuzz._make_unbudgeted_planner(shape(rng))
+            planned.update(planner.plan())
+            planner.close()
+        self.assertTrue(set(['bfs_tree_index', 'bfs_hub']) <= planned)
+        if optional.import_numpy() is not None:
+            self.assertIn('bfs_csr_numpy', planned)
+        fuzz.register_fuzz_engine('bfserr_node',
+                                  lambda el_arr: dict(enumerate(el_arr)),
+                                  bfserr.bfserr_node)
+        try:
+            (problems, timings) = fuzz.fuzz(1, 7, 10)
+        finally:
+            fuzz.register_default_engines()
+        self.assertTrue(problems)
+        self.assertTrue(all(['bfserr_node' in p for p in problems]))
+        baseline = dict((name, (0.0, 0.0)) for name in timings)
+        (problems, timings) = fuzz.fuzz(1, 7, 10, baseline)
+        self.assertEqual(len(timings), len(problems))
+
+# Runs in a worker process for test_shared_graph.
+
+def shared_graph_worker(args):
+    from onepair import bfs2
+    from onepair import shmgraph
+    (name, root_nr, target_nr) = args
+    shared = shmgraph.attach_graph(name)
+    output = bfs2.bfs2(shared.node_nr_to_ix[root_nr],
+                       shared.node_nr_to_ix[target_nr], shared.edgelist)
+    retval = (output[0], [shared.node_ix_to_nr[ix] for ix in output[1]])
+    output = None
+    shared.close()
+    return retval
+
 def main():
     """ 
     Args:    none
@@ -16,10 +16,15 @@ import random
 import sys
 import timeit
 
-from bfs1    import *
-from bfs2    import *
-from bfserr  import *
-from gendata import *
+from onepair.bfs1     import *
+from onepair.bfs2     import *
+from bfserr           import *
+from onepair.gendata  import *
+from onepair.allpairs import *
+from onepair.csr      import *
+from onepair.planner  import engine_info
+from onepair.treepath import *
+from onepair.resultsink import ResultWriter
 
 invalid_input_exit_code = 2
 
@@ -62,6 +67,12 @@ def output_eq_or_rev(output1, output2):
         revpath1.reverse()
         return pathlen1 == pathlen2 and (path1 == path2 or revpath1 == path2)
 
+# Each engine's registry entry says whether it takes an edgelist dict keyed by
+# meaningful node numbers; if not, bfs_input_helper translates to contiguous.
+
+def uses_node_numbers(bfs_func):
+    return 'any_node_numbers' in engine_info(bfs_func.__name__).capabilities
+
 global_bfs_output = (0,[0])  # used for communication from timeit function calls
 
 # Test that the example graph is written, read, and processed correctly.
@@ -111,7 +122,8 @@ def test_example(bfs_func_list, bfs_contig, errors, verbose,
 
 # Test and time with edgelist from file.
                 
-def test_file(edge_filename, bfs_func_list, bfs_contig, errors, verbose):
+def test_file(edge_filename, bfs_func_list, bfs_contig, errors, verbose,
+              sink=None):
     if not edge_filename:
         return
 
@@ -159,24 +171,33 @@ def test_file(edge_filename, bfs_func_list, bfs_contig, errors, verbose):
             (root, target, e, name) = bfs_input_helper(contig, x[0], x[1], el,
                                                        'el', el_arr,
                                                        el_nd_nr_2_ix)
-            test_str = ('{0}.{1}({2}, {3}, {4})'
-                        + '').format(bfs_func_list[i].__module__,
-                                     bfs_func_list[i].__name__,
-                                     root, target, name)
-            setup_str = ('import {0}; import gendata; import test; '
-                         + 'el = gendata.read_edgelist('
-                         + '"edgelist.txt"); (el, el_arr, el_nd_ix_2_nr, '
-                         + 'el_nd_nr_2_ix) = '
-                         + 'gendata.make_contiguous_edgelist(el); '
-                         + '(root, target, e, name) = '
-                         + 'test.bfs_input_helper({1}, '
-                         + '{2}, {3}, el, "el", '
-                         + 'el_arr, el_nd_nr_2_ix)'
-                         ).format(bfs_func_list[i].__module__, contig,
-                                  x[0], x[1])
-            t = t + timeit.timeit(test_str, setup=setup_str, number=1)
+            t = t + timeit.timeit(functools.partial(bfs_func_list[i], root,
+                                                    target, e), number=1)
         print('  {0} {1}'.format(bfs_func_list[i].__name__, t))
 
+    # Check and time the all pairs distance matrix, done in one computation.
+
+    def f():
+        global global_bfs_output
+        global_bfs_output = all_pairs_distances(el_arr)
+    t = timeit.timeit(f, number=1)
+    matrix = global_bfs_output
+    matrix_problem = False
+    for x in itertools.combinations(nodelist, 2):
+        bfs1_output = bfs1(x[0], x[1], el)
+        if sink is not None:
+            sink.write(x[0], x[1], bfs1_output)
+        expected = None if bfs1_output is None else bfs1_output[0]
+        actual = matrix[el_nd_nr_2_ix[x[0]], el_nd_nr_2_ix[x[1]]]
+        if actual != expected:
+            matrix_problem = True
+            print('  ', x[0], x[1], 'bfs1', bfs1_output)
+            print('  Inconsistent with')
+            print('  ', x[0], x[1], 'all_pairs_distances', actual)
+    if matrix_problem:
+        errors.append('test_file all pairs problem')
+    print('  all_pairs_distances {0}'.format(t))
+
 # Generate and time with tree graph.
 
 def test_tree(degree, max_depth, bfs_func_list, bfs_contig, errors, verbose):
@@ -228,7 +249,8 @@ def test_tree(degree, max_depth, bfs_func_list, bfs_contig, errors, verbose):
                         + '').format(bfs_func_list[i].__module__,
                                      bfs_func_list[i].__name__,
                                      root, target, name)
-        setup_str = ('import {0}; import gendata; import test; '
+        setup_str = ('import {0}; from onepair import gendata; '
+                     + 'import test; '
                      + '(eltree, eltree_arr, eltree_nd_ix_2_nr, '
                      + 'eltree_nd_nr_2_ix) = '
                      + 'gendata.construct_tree_edgelist'
@@ -239,10 +261,40 @@ def test_tree(degree, max_depth, bfs_func_list, bfs_contig, errors, verbose):
         print('  {0} {1} {2} {3}'.format(bfs_func_list[i].__name__,
                                          eltree_root_nr, eltree_target_nr, t))
 
+    # Times for the heap numbered tree of the same depth and degree of non-root
+    # internal nodes, between the first and last nodes at max_depth, whose path
+    # goes through the root; tree_path uses the numbering instead of searching.
+
+    arity = degree - 1
+    heaptree_arr = CSREdgelist(*construct_kary_tree_csr(arity, max_depth))
+    heaptree = dict(enumerate(heaptree_arr))
+    heaptree_root = kary_tree_nr_nodes(arity, max_depth - 1)
+    heaptree_target = len(heaptree_arr) - 1
+    print('timing heap numbered arity {0}, max_depth {1}, nr nodes {2}'.format(
+            arity, max_depth, len(heaptree_arr)))
+    heaptree_funcs = [(bfs1, heaptree), (bfs2, heaptree_arr),
+                      (tree_path, arity)]
+    heaptree_output = []
+    for (func, e) in heaptree_funcs:
+        def f():
+            global global_bfs_output
+            global_bfs_output = func(heaptree_root, heaptree_target, e)
+        t = timeit.timeit(f, number=1)
+        heaptree_output.append(global_bfs_output)
+        if verbose:
+            print('  {0} output'.format(func.__name__), global_bfs_output)
+        print('  {0} {1} {2} {3}'.format(func.__name__, heaptree_root,
+                                         heaptree_target, t))
+    if not output_eq_or_rev(heaptree_output[0], heaptree_output[-1]):
+        errors.append('test_tree tree_path problem')
+        print('  Inconsistency heap numbered tree bfs1, tree_path')
+        print('  ', heaptree_output[0])
+        print('  ', heaptree_output[-1])
+
 # Generate random graphs, choose nodes at random, test and time.
 
 def test_random(nr_reps_random, nr_nodes_random, fraction_edges,
-                bfs_func_list, bfs_contig, errors, verbose):
+                bfs_func_list, bfs_contig, errors, verbose, sink=None):
     if not (nr_reps_random > 0):
         return
 
@@ -289,6 +341,8 @@ def test_random(nr_reps_random, nr_nodes_random, fraction_edges,
                 global_bfs_output = bfs_output_helper(
                     contig, bfs_func_list[i](root, target, e), ran_nd_ix_2_nr)
             ran_t[i] = ran_t[i] + timeit.timeit(f, number=1)
+            if sink is not None and i == 0:
+                sink.write(ran_root_nr, ran_target_nr, global_bfs_output)
             if global_bfs_output is None:
                 tot_nr_no_paths = tot_nr_no_paths + 1
             else:
@@ -338,6 +392,7 @@ Usage: python test.py [-e <edge_file>]
                       [-r <nr_reps_random>]
                       [-n <nr_nodes_random>]
                       [-f <fraction_edges>]
+                      [-o <output_file>]
                       [-v] [-h]
   long versions:      [--edge_file <edge_file>]
                       [--degree <degree>]
@@ -345,8 +400,11 @@ Usage: python test.py [-e <edge_file>]
                       [--nr_reps_random <nr_reps_random>]
                       [--nr_nodes_random <nr_nodes_random>]
                       [--fraction_edges <fraction_edges>]
+                      [--output_file <output_file>]
                       [--verbose] [--help]
   defaults: python test.py -e {0} -d {1} -m {2} -r {3} -n {4} -f {5}
+  -o also writes the bfs1 results for all pairs in the edge file and for the
+  random graphs to output_file, in resultsink format.
   If -h is present, just print this info.
 """.format(d_edge_filename, d_degree, d_max_depth,
            d_nr_reps_random, d_nr_nodes_random, d_fraction_edges))
@@ -355,7 +413,7 @@ Usage: python test.py [-e <edge_file>]
 
 def get_cmdline_options(argv, edge_filename, degree, max_depth,
                         nr_reps_random, nr_nodes_random, fraction_edges,
-                        verbose):
+                        verbose, output_filename=''):
     # save default values
     d_edge_filename   = edge_filename
     d_degree          = degree
@@ -369,11 +427,12 @@ def get_cmdline_options(argv, edge_filename, degree, max_depth,
     if isinstance(argv, str):
         argv = argv.split(' ')
     try:
-        (opts, args) = getopt.getopt(argv, 'e:d:m:r:n:f:vh',
+        (opts, args) = getopt.getopt(argv, 'e:d:m:r:n:f:o:vh',
                                      ['edge_file', 'degree=', 'max_depth=',
                                       'nr_reps_random=',
                                       'nr_nodes_random=',
                                       'fraction_edges=',
+                                      'output_file=',
                                       'verbose', 'help'])
     except getopt.GetoptError as err:
         print(str(err))
@@ -454,6 +513,8 @@ def get_cmdline_options(argv, edge_filename, degree, max_depth,
                 usage(d_edge_filename, d_degree, d_max_depth,
                       d_nr_reps_random, d_nr_nodes_random, d_fraction_edges)
                 sys.exit(invalid_input_exit_code)
+        elif opt in ('-o', '--output_file'):
+            output_filename = arg
         elif opt in ('-v', '--verbose'):
             verbose = True
         elif opt in ('-h', '--help'):
@@ -462,7 +523,7 @@ def get_cmdline_options(argv, edge_filename, degree, max_depth,
             sys.exit(0)
 
     return (edge_filename, degree, max_depth, nr_reps_random, nr_nodes_random,
-            fraction_edges, verbose)
+            fraction_edges, verbose, output_filename)
 
 def test(argv,
          example_err=False, file_err=False, tree_err=False, ran_err=False):
@@ -475,20 +536,24 @@ def test(argv,
     nr_nodes_random = 10000
     fraction_edges  = 0.005
     verbose         = False
+    output_filename = ''
     (edge_filename, degree, max_depth, nr_reps_random, nr_nodes_random,
-     fraction_edges, verbose) = get_cmdline_options(argv,
+     fraction_edges, verbose, output_filename) = get_cmdline_options(argv,
                                                     edge_filename,
                                                     degree,
                                                     max_depth,
                                                     nr_reps_random,
                                                     nr_nodes_random,
                                                     fraction_edges,
-                                                    verbose)
+                                                    verbose,
+                                                    output_filename)
     bfs_func_list = [bfs1, bfs2]
     bfserr_func_ix = 1
     bfs_func_list_save = list(bfs_func_list)
-    bfs_contig = [False, False]
+    bfs_contig = [not uses_node_numbers(bfs_func)
+                  for bfs_func in bfs_func_list]
     errors = []
+    sink = ResultWriter(output_filename) if output_filename else None
 
     if example_err:
         bfs_func_list[bfserr_func_ix] = bfserr_node
@@ -499,7 +564,7 @@ def test(argv,
     if file_err:
         bfs_func_list[bfserr_func_ix] = bfserr_none
     test_file(edge_filename,
-              bfs_func_list, bfs_contig, errors, verbose)
+              bfs_func_list, bfs_contig, errors, verbose, sink)
     if file_err:
         bfs_func_list[bfserr_func_ix] = bfs_func_list_save[bfserr_func_ix]
 
@@ -513,10 +578,12 @@ def test(argv,
     if ran_err:
         bfs_func_list[bfserr_func_ix] = bfserr_len
     test_random(nr_reps_random, nr_nodes_random, fraction_edges,
-                bfs_func_list, bfs_contig, errors, verbose)
+                bfs_func_list, bfs_contig, errors, verbose, sink)
     if ran_err:
         bfs_func_list[bfserr_func_ix] = bfs_func_list_save[bfserr_func_ix]
 
+    if sink is not None:
+        sink.close()
     if errors:
         print(errors)
     return errors